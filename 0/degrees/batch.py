@@ -0,0 +1,153 @@
+"""
+Batch degrees of separation queries.
+
+Reads (source, target) pairs of names or IMDB ids from a CSV file,
+groups them by source so each distinct source needs a single BFS, and
+fans the groups out over a process pool. Results are written as CSV.
+
+Modes:
+    path    one shortest path per pair
+    all     every shortest path per pair, one row each
+    count   the number of shortest paths per pair
+"""
+
+import argparse
+import csv
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import degrees
+
+MODES = ("path", "all", "count")
+
+
+def read_pairs(filename):
+    """
+    Returns the (source, target) rows of a CSV file, skipping a
+    "source,target" header if present.
+    """
+    with open(filename, encoding="utf-8", newline="") as f:
+        rows = [row for row in csv.reader(f) if row]
+    if rows and [cell.strip().lower() for cell in rows[0][:2]] == ["source", "target"]:
+        rows = rows[1:]
+    return [(row[0].strip(), row[1].strip()) for row in rows]
+
+
+def group_by_source(pairs):
+    """
+    Resolves pairs to person_ids and groups them by source. Returns a
+    dictionary of source -> [(query index, target)] and a dictionary of
+    query index -> error message for pairs that could not be resolved.
+    """
+    groups = {}
+    errors = {}
+    for i, (source, target) in enumerate(pairs):
+        try:
+            source = degrees.resolve_person(source)
+            target = degrees.resolve_person(target)
+        except LookupError as e:
+            errors[i] = str(e.args[0])
+            continue
+        groups.setdefault(source, []).append((i, target))
+    return groups, errors
+
+
+def solve_group(source, queries, mode):
+    """
+    Answers every (query index, target) query for one source with a
+    single BFS. Returns a list of (query index, degrees, result) rows,
+    where result is a path, or a count in count mode.
+    """
+    state = degrees.person_state(source)
+    targets = [target for _, target in queries
+               if degrees.connected(source, target)]
+    states = [degrees.person_state(target) for target in targets]
+
+    if mode == "path":
+        tree = degrees.bfs_tree(state, degrees.state_neighbors(), states)
+    else:
+        parents = degrees.bfs_parents(state, degrees.full_neighbors(), states)
+
+    rows = []
+    for i, target in queries:
+        target_state = degrees.person_state(target)
+        if mode == "path":
+            path = degrees.decode_path(degrees.tree_path(tree, target_state))
+            rows.append((i, None if path is None else len(path), path))
+        elif target_state not in parents:
+            rows.append((i, None, 0 if mode == "count" else None))
+        elif mode == "count":
+            rows.append((i, parents[target_state][0],
+                         degrees.count_paths(parents, target_state)))
+        else:
+            for path in degrees.all_paths(parents, target_state):
+                rows.append((i, len(path), degrees.decode_path(path)))
+    return rows
+
+
+def format_path(path):
+    """Formats a path as movie_id:person_id steps separated by spaces."""
+    if path is None:
+        return ""
+    return " ".join(f"{movie_id}:{person_id}" for movie_id, person_id in path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch degrees of separation queries")
+    parser.add_argument("pairs", help="CSV file of source,target names or ids")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("--backend", choices=["dict", "compact"], default="compact",
+                        help="in-memory graph representation")
+    parser.add_argument("--projection", action="store_true",
+                        help="search a precomputed co-star projection (compact only)")
+    parser.add_argument("--mode", choices=MODES, default="path")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="process pool size (default: CPU count)")
+    parser.add_argument("--output", help="write results here instead of stdout")
+    args = parser.parse_args()
+
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(args.directory, args.backend, projection=args.projection)
+    print("Data loaded.", file=sys.stderr)
+
+    pairs = read_pairs(args.pairs)
+    groups, errors = group_by_source(pairs)
+    print(f"{len(pairs)} queries from {len(groups)} distinct sources.", file=sys.stderr)
+
+    # Forked workers inherit the loaded data; spawned ones load their own
+    if "fork" in multiprocessing.get_all_start_methods():
+        pool = ProcessPoolExecutor(args.workers, multiprocessing.get_context("fork"))
+    else:
+        pool = ProcessPoolExecutor(
+            args.workers, initializer=degrees.load_data,
+            initargs=(args.directory, args.backend, True, args.projection))
+
+    results = {i: [] for i in range(len(pairs))}
+    with pool:
+        futures = [pool.submit(solve_group, source, queries, args.mode)
+                   for source, queries in groups.items()]
+        for future in futures:
+            for i, separation, result in future.result():
+                results[i].append((separation, result))
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        writer = csv.writer(out)
+        writer.writerow(["source", "target", "degrees",
+                         "count" if args.mode == "count" else "path", "error"])
+        for i, (source, target) in enumerate(pairs):
+            if i in errors:
+                writer.writerow([source, target, "", "", errors[i]])
+            for separation, result in results[i]:
+                if args.mode != "count":
+                    result = format_path(result)
+                writer.writerow([source, target,
+                                 "" if separation is None else separation, result, ""])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
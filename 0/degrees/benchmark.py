@@ -0,0 +1,165 @@
+"""
+Benchmarks degrees.py loading and queries on a dataset directory.
+
+Each configuration (backend, cache, projection) runs in a fresh worker
+process so load times and resident memory are not skewed by earlier
+runs. Every configuration answers the same seeded random query set.
+Results are written as JSON.
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import degrees
+
+
+def summarize(timings):
+    """Returns count, total and percentile statistics for timings in seconds."""
+    if not timings:
+        return {"count": 0}
+    timings = sorted(timings)
+
+    def percentile(p):
+        return timings[min(len(timings) - 1, int(p * len(timings)))]
+
+    return {
+        "count": len(timings),
+        "total_s": sum(timings),
+        "mean_s": statistics.fmean(timings),
+        "p50_s": percentile(0.5),
+        "p95_s": percentile(0.95),
+        "max_s": timings[-1]
+    }
+
+
+def timed(function, *args):
+    """Returns (result, seconds) for one call of function."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def choose_queries(directory, count, seed):
+    """
+    Returns a fixed random query set for a dataset: person ids for
+    neighbor lookups, unambiguous names and (source, target) pairs.
+    """
+    degrees.load_data(directory, "compact")
+    rng = random.Random(seed)
+    person_ids = sorted(degrees.people)
+    names = sorted(name for name, ids in degrees.names.items() if len(ids) == 1)
+    return {
+        "people": rng.sample(person_ids, min(count, len(person_ids))),
+        "names": rng.sample(names, min(count, len(names))),
+        "pairs": [rng.sample(person_ids, 2) for _ in range(count)]
+    }
+
+
+def run_config(directory, config, queries, methods, landmarks=0):
+    """
+    Loads the dataset with one configuration and times each operation
+    over the query set, preparing landmarks first if astar is among
+    methods. Meant to run in a fresh process.
+    """
+    _, load_time = timed(degrees.load_data, directory, config["backend"],
+                         config["cache"], config["projection"])
+    result = {
+        "config": config,
+        "load_s": load_time,
+        "resident_memory_bytes": degrees.resident_memory(),
+        "operations": {}
+    }
+    operations = result["operations"]
+
+    if "astar" in methods:
+        _, seconds = timed(degrees.load_landmarks, directory, landmarks)
+        result["landmarks_s"] = seconds
+
+    timings = [timed(degrees.person_id_for_name, name)[1] for name in queries["names"]]
+    operations["person_id_for_name"] = summarize(timings)
+
+    timings = [timed(degrees.neighbors_for_person, person_id)[1]
+               for person_id in queries["people"]]
+    operations["neighbors_for_person"] = summarize(timings)
+
+    for method in methods:
+        timings = []
+        lengths = []
+        for source, target in queries["pairs"]:
+            path, seconds = timed(degrees.shortest_path, source, target, method)
+            timings.append(seconds)
+            lengths.append(None if path is None else len(path))
+        operations[f"shortest_path[{method}]"] = summarize(timings)
+        operations[f"shortest_path[{method}]"]["connected"] = sum(
+            length is not None for length in lengths)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark degrees.py")
+    parser.add_argument("directory")
+    parser.add_argument("--backends", nargs="+", choices=["dict", "compact"],
+                        default=["dict", "compact"])
+    parser.add_argument("--methods", nargs="+", choices=degrees.SEARCH_METHODS,
+                        default=["bidirectional", "bfs"],
+                        help="shortest path algorithms to time; astar needs --landmarks")
+    parser.add_argument("--landmarks", type=int, default=0, metavar="K",
+                        help="landmarks to prepare for astar")
+    parser.add_argument("--projection", action="store_true",
+                        help="also benchmark compact with the co-star projection")
+    parser.add_argument("--no-cache", dest="cache", action="store_false",
+                        help="always parse the CSV files, ignoring snapshots")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark.json")
+    args = parser.parse_args()
+    if "astar" in args.methods:
+        if not args.landmarks:
+            parser.error("astar needs --landmarks")
+        if "dict" in args.backends:
+            parser.error("astar needs --backends compact")
+
+    configs = [{"backend": backend, "cache": args.cache, "projection": False}
+               for backend in args.backends]
+    if args.projection:
+        configs.append({"backend": "compact", "cache": args.cache, "projection": True})
+
+    with ProcessPoolExecutor(1) as pool:
+        queries = pool.submit(choose_queries, args.directory, args.queries, args.seed).result()
+
+    results = []
+    for config in configs:
+        print(f"Running {config}...", file=sys.stderr)
+        with ProcessPoolExecutor(1) as pool:
+            result = pool.submit(run_config, args.directory, config,
+                                 queries, args.methods, args.landmarks).result()
+        results.append(result)
+        print(f"    load {result['load_s']:.2f}s, "
+              f"{result['resident_memory_bytes'] / 2 ** 20:.1f} MiB", file=sys.stderr)
+        if "landmarks_s" in result:
+            print(f"    landmarks {result['landmarks_s']:.2f}s", file=sys.stderr)
+        for name, stats in result["operations"].items():
+            print(f"    {name}: mean {stats.get('mean_s', 0) * 1000:.3f} ms", file=sys.stderr)
+
+    report = {
+        "directory": args.directory,
+        "queries": args.queries,
+        "seed": args.seed,
+        "landmarks": args.landmarks,
+        "python": sys.version,
+        "platform": platform.platform(),
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
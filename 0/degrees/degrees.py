@@ -1,7 +1,15 @@
+import argparse
 import csv
+import functools
 import sys
+import time
+from array import array
+from collections import Counter
 
-from util import Node, StackFrontier, QueueFrontier
+import snapshot
+from landmarks import load_landmarks as build_landmarks
+from graph import CompactGraph, NamesView, PeopleView, MoviesView, find, union
+from util import Node, StackFrontier, QueueFrontier, PriorityFrontier
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -12,11 +20,58 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Maps person_ids to a connected component label (dict backend only)
+components = {}
 
-def load_data(directory):
+# CompactGraph backing names, people and movies, or None for plain dicts
+graph = None
+
+# Landmark distance oracle over graph, or None until load_landmarks
+landmarks = None
+
+# Search algorithms selectable in shortest_path, default first
+SEARCH_METHODS = ("bidirectional", "bfs", "astar")
+
+# Parent markers in a FlatTree
+ROOT = -1
+UNREACHED = -2
+
+
+def load_data(directory, backend="dict", cache=True, projection=False):
     """
     Load data from CSV files into memory.
+
+    With backend="compact", ids are interned into a CompactGraph and
+    names, people and movies become read-only views over it.
+
+    With cache=True, the parsed graph is read from (or written to) a
+    binary snapshot next to the CSV files, rebuilt when they change.
+
+    With projection=True (compact backend only), searches run over a
+    precomputed person -> person co-star projection.
     """
+    global graph, names, people, movies, components, landmarks
+    landmarks = None
+    if backend == "compact":
+        if cache:
+            graph = snapshot.load_graph(directory, projection)
+        else:
+            graph = CompactGraph.from_csv(directory)
+            if projection:
+                graph.project_costars()
+        names = NamesView(graph)
+        people = PeopleView(graph)
+        movies = MoviesView(graph)
+        return
+    if projection:
+        raise ValueError("the co-star projection needs the compact backend")
+    if graph is not None:
+        names, people, movies, components = {}, {}, {}, {}
+    graph = None
+    if cache:
+        load_dicts(snapshot.load_graph(directory))
+        return
+
     # Load people
     with open(f"{directory}/people.csv", encoding="utf-8") as f:
         reader = csv.DictReader(f)
@@ -51,16 +106,156 @@ def load_data(directory):
             except KeyError:
                 pass
 
+    label_components()
+
+
+def load_landmarks(directory, k):
+    """
+    Load (or build and save) k landmark distance arrays for the
+    compact backend, enabling estimate_degrees and astar search.
+    """
+    global landmarks
+    if graph is None:
+        raise ValueError("landmarks need the compact backend")
+    landmarks = build_landmarks(graph, directory, k, snapshot.source_key(directory))
+
+
+def estimate_degrees(source, target):
+    """
+    Returns (lower, upper) bounds on the degrees of separation between
+    two person_ids from the landmarks. upper is None when unknown.
+    """
+    if landmarks is None:
+        raise ValueError("no landmarks loaded")
+    return landmarks.bounds(graph.person_index[source], graph.person_index[target])
+
+
+def load_dicts(compact):
+    """
+    Fill names, people and movies dictionaries from a CompactGraph.
+    """
+    for person, person_id in enumerate(compact.person_ids):
+        name = compact.person_names[person]
+        people[person_id] = {
+            "name": name,
+            "birth": compact.person_births[person],
+            "movies": {compact.movie_ids[movie] for movie in compact.movies_of(person)}
+        }
+        if name.lower() not in names:
+            names[name.lower()] = {person_id}
+        else:
+            names[name.lower()].add(person_id)
+
+    for movie, movie_id in enumerate(compact.movie_ids):
+        movies[movie_id] = {
+            "title": compact.movie_titles[movie],
+            "year": compact.movie_years[movie],
+            "stars": {compact.person_ids[person] for person in compact.stars_of(movie)}
+        }
+
+    for person, person_id in enumerate(compact.person_ids):
+        components[person_id] = compact.components[person]
+
+
+def label_components():
+    """
+    Labels every person in the dictionaries with their connected
+    component, found by union-find over each movie's stars.
+    """
+    parent = {person_id: person_id for person_id in people}
+    size = dict.fromkeys(people, 1)
+    for movie in movies.values():
+        stars = list(movie["stars"])
+        for star in stars[1:]:
+            union(parent, size, stars[0], star)
+    for person_id in people:
+        components[person_id] = find(parent, person_id)
+
+
+def connected(source, target):
+    """
+    Returns False if source and target are known to be in different
+    connected components, True otherwise.
+    """
+    if graph is not None:
+        labels = graph.components
+        return (labels[graph.person_index[source]]
+                == labels[graph.person_index[target]])
+    if source not in components or target not in components:
+        return True
+    return components[source] == components[target]
+
+
+def component_sizes():
+    """
+    Returns a Counter mapping each component size to the number of
+    components of that size.
+    """
+    labels = graph.components if graph is not None else components.values()
+    return Counter(Counter(labels).values())
+
+
+def resident_memory():
+    """
+    Returns the resident set size of this process in bytes.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+    import resource
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024
+
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    parser = argparse.ArgumentParser(description="Degrees of separation")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("--backend", choices=["dict", "compact"], default="dict",
+                        help="in-memory graph representation")
+    parser.add_argument("--projection", action="store_true",
+                        help="search a precomputed co-star projection (compact only)")
+    parser.add_argument("--no-cache", dest="cache", action="store_false",
+                        help="always parse the CSV files, ignoring snapshots")
+    parser.add_argument("--stats", action="store_true",
+                        help="report load time and resident memory")
+    parser.add_argument("--components", action="store_true",
+                        help="print connected component size statistics")
+    parser.add_argument("--search", choices=SEARCH_METHODS,
+                        default=SEARCH_METHODS[0],
+                        help="shortest path algorithm; bidirectional is the fast "
+                             "exact one, astar is exact but slower than bfs on "
+                             "small-world casts, where landmark bounds are loose")
+    parser.add_argument("--landmarks", type=int, default=0, metavar="K",
+                        help="precompute K landmarks for distance estimates "
+                             "(and astar)")
+    args = parser.parse_args()
+    if args.projection and args.backend != "compact":
+        parser.error("--projection needs --backend compact")
+    if args.landmarks and args.backend != "compact":
+        parser.error("--landmarks needs --backend compact")
+    if args.search == "astar" and not args.landmarks:
+        parser.error("--search astar needs --landmarks")
 
     # Load data from files into memory
     print("Loading data...")
-    load_data(directory)
+    start = time.perf_counter()
+    load_data(args.directory, args.backend, args.cache, args.projection)
+    elapsed = time.perf_counter() - start
     print("Data loaded.")
+    if args.stats:
+        print(f"Backend: {args.backend}, load time: {elapsed:.2f}s, "
+              f"resident memory: {resident_memory() / 2 ** 20:.1f} MiB")
+    if args.components:
+        print_component_stats()
+    if args.landmarks:
+        print("Preparing landmarks...")
+        load_landmarks(args.directory, args.landmarks)
 
     source = person_id_for_name(input("Name: "))
     if source is None:
@@ -69,7 +264,14 @@ def main():
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    if landmarks is not None and connected(source, target):
+        lower, upper = estimate_degrees(source, target)
+        if upper is None:
+            print(f"Estimated degrees: at least {lower}, upper bound unknown.")
+        else:
+            print(f"Estimated degrees: at least {lower}, at most {upper}.")
+
+    path = shortest_path(source, target, args.search)
 
     if path is None:
         print("Not connected.")
@@ -84,12 +286,76 @@ def main():
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
+def print_component_stats():
+    """
+    Prints the number of connected components and their sizes.
+    """
+    sizes = component_sizes()
+    total = sum(sizes.values())
+    people_count = sum(size * count for size, count in sizes.items())
+    largest = max(sizes, default=0)
+    print(f"{total} components over {people_count} people.")
+    print(f"Largest component: {largest} people "
+          f"({largest / max(people_count, 1):.1%}).")
+    print(f"Isolated people: {sizes.get(1, 0)}")
+    for size, count in sorted(sizes.items(), reverse=True)[:10]:
+        print(f"    size {size}: {count} component(s)")
+
+
+def shortest_path(source, target, method="bidirectional"):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
-    If no possible path, returns None.
+    method is one of SEARCH_METHODS. If no possible path, returns None.
+    """
+    if not connected(source, target):
+        return None
+
+    if method == "bfs":
+        search = bfs
+    elif method == "bidirectional":
+        search = bidirectional_bfs
+    elif method == "astar":
+        if landmarks is None:
+            raise ValueError("astar search needs landmarks, see load_landmarks")
+        search = functools.partial(astar, heuristic=landmarks.heuristic)
+    else:
+        raise ValueError(f"unknown search method {method!r}")
+
+    path = search(person_state(source), person_state(target), state_neighbors())
+    return decode_path(path)
+
+
+def person_state(person_id):
+    """
+    Returns the search state for a person_id: the id itself for the dict
+    backend, or its graph index for the compact backend.
+    """
+    return person_id if graph is None else graph.person_index[person_id]
+
+
+def state_neighbors():
+    """
+    Returns the neighbors(state) function searches should use for the
+    loaded backend.
+    """
+    return neighbors_for_person if graph is None else graph.search_neighbors()
+
+
+def full_neighbors():
+    """
+    Returns a neighbors(state) function that yields every shared movie,
+    not just one witness, for searches that enumerate all paths.
+    """
+    return neighbors_for_person if graph is None else graph.neighbors
+
+
+def bfs(source, target, neighbors):
+    """
+    Breadth-first search from source to target, where neighbors(state)
+    returns (action, state) pairs. Returns a list of [action, state]
+    pairs, or None if target is unreachable.
     """
     start = Node(source, None, None)
     frontier = QueueFrontier()
@@ -103,7 +369,7 @@ def shortest_path(source, target):
         cur = frontier.remove()
         visited.add(cur.state)
 
-        movie_stars = neighbors_for_person(cur.state)
+        movie_stars = neighbors(cur.state)
         for action, state in movie_stars:
             if (state == target):
                 path = []
@@ -116,6 +382,335 @@ def shortest_path(source, target):
             if (state not in visited and not frontier.contains_state(state)):
                 frontier.add(Node(state, cur, action))
 
+
+def astar(source, target, neighbors, heuristic):
+    """
+    A* search from source to target with unit step costs, where
+    heuristic(target) returns a consistent estimate h(state) of the
+    remaining distance. Returns the same path format as bfs, or None.
+    """
+    if source == target:
+        return []
+    h = heuristic(target)
+
+    # Estimates are computed once per state, as each costs a pass over
+    # every landmark
+    estimates = {source: h(source)}
+    frontier = PriorityFrontier()
+    frontier.add(Node(source, None, None), (estimates[source], 0))
+    cost = {source: 0}
+    explored = set()
+
+    while not frontier.empty():
+        node = frontier.remove()
+        if node.state == target:
+            return node_path(node)
+        explored.add(node.state)
+
+        # Prefer deeper nodes among equal estimates
+        step = cost[node.state] + 1
+        for action, state in neighbors(node.state):
+            if state == target and estimates[node.state] >= 1:
+                # No path through the frontier can be shorter than
+                # cost + h of the node just removed, which step matches
+                return node_path(Node(state, node, action))
+            if state in explored:
+                continue
+            if state not in cost or step < cost[state]:
+                cost[state] = step
+                estimate = estimates.get(state)
+                if estimate is None:
+                    estimate = estimates[state] = h(state)
+                frontier.add(Node(state, node, action), (step + estimate, -step))
+
+    return None
+
+
+def node_path(node):
+    """Returns the [action, state] pairs leading from the root to node."""
+    path = []
+    while node.parent is not None:
+        path.append([node.action, node.state])
+        node = node.parent
+    path.reverse()
+    return path
+
+
+def bidirectional_bfs(source, target, neighbors):
+    """
+    Breadth-first search grown from both source and target, always
+    expanding the smaller frontier by one full level. neighbors must be
+    symmetric. Returns the same path format as bfs, or None.
+    """
+    if source == target:
+        return []
+
+    # Map each reached state to (action, state one step closer to that
+    # side's root, depth)
+    forward = {source: (None, None, 0)}
+    backward = {target: (None, None, 0)}
+    forward_frontier = [source]
+    backward_frontier = [target]
+
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meeting = expand_level(
+                forward_frontier, forward, backward, neighbors)
+        else:
+            backward_frontier, meeting = expand_level(
+                backward_frontier, backward, forward, neighbors)
+
+        if meeting is not None:
+            # Walk back to the source, then on towards the target
+            path = []
+            state = meeting
+            while forward[state][1] is not None:
+                action, parent, _ = forward[state]
+                path.append([action, state])
+                state = parent
+            path.reverse()
+            state = meeting
+            while backward[state][1] is not None:
+                action, child, _ = backward[state]
+                path.append([action, child])
+                state = child
+            return path
+
+    return None
+
+
+def expand_level(frontier, reached, other, neighbors):
+    """
+    Expands every state in frontier by one step, recording new states in
+    reached. Returns the next frontier and the state where the two
+    searches meet on the shortest combined path, or None.
+    """
+    next_frontier = []
+    meeting = None
+    best = None
+    for state in frontier:
+        depth = reached[state][2] + 1
+        for action, neighbor in neighbors(state):
+            if neighbor in reached:
+                continue
+            reached[neighbor] = (action, state, depth)
+            next_frontier.append(neighbor)
+            if neighbor in other:
+                length = depth + other[neighbor][2]
+                if best is None or length < best:
+                    best = length
+                    meeting = neighbor
+    return next_frontier, meeting
+
+
+def bfs_tree(source, neighbors, targets=None):
+    """
+    Breadth-first search from source over its whole component, or until
+    every state in targets is reached. Returns a dictionary mapping every
+    reached state to the (action, parent) pair that first reached it;
+    source maps to (None, None).
+    """
+    tree = {source: (None, None)}
+    remaining = None if targets is None else set(targets) - {source}
+    frontier = [source]
+    while frontier and remaining != set():
+        next_frontier = []
+        for state in frontier:
+            for action, neighbor in neighbors(state):
+                if neighbor not in tree:
+                    tree[neighbor] = (action, state)
+                    next_frontier.append(neighbor)
+                    if remaining is not None:
+                        remaining.discard(neighbor)
+        frontier = next_frontier
+    return tree
+
+
+class FlatTree():
+    """
+    A bfs_tree over compact person indices, held in two flat int arrays
+    (parent and witness movie per person) instead of a dictionary. It
+    answers the same `state in tree` and `tree[state]` lookups, so
+    tree_path works on either.
+    """
+
+    def __init__(self, parents, movies):
+        self.parents = parents
+        self.movies = movies
+
+    def __contains__(self, state):
+        return self.parents[state] != UNREACHED
+
+    def __getitem__(self, state):
+        parent = self.parents[state]
+        if parent == UNREACHED:
+            raise KeyError(state)
+        if parent == ROOT:
+            return (None, None)
+        return (self.movies[state], parent)
+
+    def nbytes(self):
+        """Returns the memory held by the tree's arrays."""
+        return (len(self.parents) * self.parents.itemsize
+                + len(self.movies) * self.movies.itemsize)
+
+
+def bfs_flat_tree(source, neighbors, count):
+    """
+    Breadth-first search from person index source over its whole
+    component, among count people. Returns a FlatTree, which costs 8
+    bytes per person in the graph however much of it is reached.
+    """
+    parents = array("i", [UNREACHED]) * count
+    movies = array("i", [-1]) * count
+    parents[source] = ROOT
+    frontier = [source]
+    while frontier:
+        next_frontier = []
+        for state in frontier:
+            for movie, neighbor in neighbors(state):
+                if parents[neighbor] == UNREACHED:
+                    parents[neighbor] = state
+                    movies[neighbor] = movie
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return FlatTree(parents, movies)
+
+
+def bfs_parents(source, neighbors, targets=None):
+    """
+    Breadth-first search from source that records every shortest-path
+    predecessor, stopping after the level where the last of targets is
+    reached. Returns a dictionary mapping each reached state to its
+    depth and list of (action, parent) pairs.
+    """
+    depth = {source: 0}
+    parents = {source: []}
+    remaining = None if targets is None else set(targets) - {source}
+    frontier = [source]
+    while frontier and remaining != set():
+        next_frontier = []
+        for state in frontier:
+            step = depth[state] + 1
+            for action, neighbor in neighbors(state):
+                if neighbor not in depth:
+                    depth[neighbor] = step
+                    parents[neighbor] = []
+                    next_frontier.append(neighbor)
+                    if remaining is not None:
+                        remaining.discard(neighbor)
+                if depth[neighbor] == step:
+                    parents[neighbor].append((action, state))
+        frontier = next_frontier
+    return {state: (depth[state], parents[state]) for state in depth}
+
+
+def count_paths(parents, target):
+    """
+    Returns the number of distinct shortest paths to target in a
+    bfs_parents result, counting each shared movie separately.
+    """
+    if target not in parents:
+        return 0
+
+    # Process states in increasing depth so predecessors come first
+    counts = {}
+    pending = [target]
+    needed = {target}
+    while pending:
+        state = pending.pop()
+        for _, parent in parents[state][1]:
+            if parent not in needed:
+                needed.add(parent)
+                pending.append(parent)
+    for state in sorted(needed, key=lambda state: parents[state][0]):
+        links = parents[state][1]
+        counts[state] = 1 if not links else sum(counts[parent] for _, parent in links)
+    return counts[target]
+
+
+def all_paths(parents, target):
+    """
+    Yields every shortest [action, state] path to target in a
+    bfs_parents result.
+    """
+    if target not in parents:
+        return
+    if not parents[target][1]:
+        yield []
+        return
+    for action, parent in parents[target][1]:
+        for path in all_paths(parents, parent):
+            yield path + [[action, target]]
+
+
+def all_shortest_paths(source, target):
+    """
+    Returns every shortest list of (movie_id, person_id) pairs that
+    connects the source to the target, or an empty list if none does.
+    """
+    if not connected(source, target):
+        return []
+    parents = bfs_parents(person_state(source), full_neighbors(), [person_state(target)])
+    return [decode_path(path) for path in all_paths(parents, person_state(target))]
+
+
+def count_shortest_paths(source, target):
+    """
+    Returns the number of shortest paths connecting the source to the
+    target, without listing them.
+    """
+    if not connected(source, target):
+        return 0
+    parents = bfs_parents(person_state(source), full_neighbors(), [person_state(target)])
+    return count_paths(parents, person_state(target))
+
+
+def tree_path(tree, target):
+    """
+    Returns the [action, state] path from the root of a bfs_tree to
+    target, or None if target was not reached.
+    """
+    if target not in tree:
+        return None
+    path = []
+    action, parent = tree[target]
+    while parent is not None:
+        path.append([action, target])
+        target = parent
+        action, parent = tree[target]
+    path.reverse()
+    return path
+
+
+def decode_path(path):
+    """
+    Maps a path of search states back to (movie_id, person_id) pairs.
+    """
+    if path is None or graph is None:
+        return path
+    return [[graph.movie_ids[movie], graph.person_ids[person]]
+            for movie, person in path]
+
+
+def resolve_person(person):
+    """
+    Returns the person_id for an IMDB id or a name, without prompting.
+    Raises LookupError if there is no such person or the name is
+    ambiguous.
+    """
+    if not isinstance(person, str):
+        raise LookupError("person must be a string")
+    if person in people:
+        return person
+    person_ids = names.get(person.lower(), set())
+    if len(person_ids) == 0:
+        raise LookupError(f"person not found: {person}")
+    if len(person_ids) > 1:
+        raise LookupError(f"ambiguous name {person}: {sorted(person_ids)}")
+    return next(iter(person_ids))
+
+
 def person_id_for_name(name):
     """
     Returns the IMDB id for a person's name,
@@ -147,6 +742,9 @@ def neighbors_for_person(person_id):
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
+    if graph is not None:
+        return {(graph.movie_ids[movie], graph.person_ids[person])
+                for movie, person in graph.neighbors(graph.person_index[person_id])}
     movie_ids = people[person_id]["movies"]
     neighbors = set()
     for movie_id in movie_ids:
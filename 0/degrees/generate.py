@@ -0,0 +1,124 @@
+"""
+Generates a synthetic IMDB-style dataset for degrees.py.
+
+Writes people.csv, movies.csv and stars.csv in the same format as the
+small and large directories. Cast sizes follow a power law, and actors
+are drawn with power-law popularity, so a few hubs appear in many
+movies while most people appear in one or two.
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import random
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael",
+    "Linda", "William", "Elizabeth", "David", "Barbara", "Richard", "Susan",
+    "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen", "Daniel",
+    "Nancy", "Matthew", "Lisa", "Anthony", "Betty", "Mark", "Margaret",
+    "Paul", "Sandra", "Steven", "Ashley", "Andrew", "Emily", "Kenneth",
+    "Donna", "Joshua", "Michelle", "Kevin", "Carol", "Brian", "Amanda",
+    "George", "Melissa", "Timothy", "Deborah", "Ronald", "Stephanie"
+]
+
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller",
+    "Davis", "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez",
+    "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark",
+    "Ramirez", "Lewis", "Robinson", "Walker", "Young", "Allen", "King",
+    "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores", "Green",
+    "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell"
+]
+
+TITLE_WORDS = [
+    "Night", "City", "Love", "Last", "Dark", "Star", "River", "Blood",
+    "Summer", "Winter", "Secret", "Lost", "Return", "King", "House",
+    "Road", "Fire", "Shadow", "Dream", "Heart", "Ghost", "Storm", "Gold",
+    "Silent", "Wild", "Broken", "Empire", "Island", "Stranger", "Glass"
+]
+
+
+def cast_size(rng, exponent, smallest, largest):
+    """
+    Samples a cast size from a discrete power law with the given
+    exponent, clamped to [smallest, largest].
+    """
+    size = int(smallest * (1 - rng.random()) ** (-1 / (exponent - 1)))
+    return max(smallest, min(size, largest))
+
+
+def person_name(i):
+    """Returns a synthetic name; the name space is small enough to collide."""
+    first = FIRST_NAMES[i % len(FIRST_NAMES)]
+    last = LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    suffix = i // (len(FIRST_NAMES) * len(LAST_NAMES))
+    return f"{first} {last}" if suffix == 0 else f"{first} {last} {suffix}"
+
+
+def generate(directory, people, movies, seed=0, cast_exponent=2.2,
+             popularity_exponent=0.8, smallest_cast=3, largest_cast=60):
+    """
+    Writes a synthetic dataset with the given number of people and
+    movies to directory.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+
+    # Person ids are shuffled so id order carries no popularity signal
+    person_ids = rng.sample(range(100000, 100000 + people * 10), people)
+    with open(os.path.join(directory, "people.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "birth"])
+        for person_id in person_ids:
+            birth = rng.randint(1900, 2005) if rng.random() < 0.8 else ""
+            writer.writerow([person_id, person_name(rng.randrange(people)), birth])
+
+    movie_ids = rng.sample(range(1000000, 1000000 + movies * 10), movies)
+    with open(os.path.join(directory, "movies.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "title", "year"])
+        for movie_id in movie_ids:
+            title = " ".join(rng.sample(TITLE_WORDS, rng.randint(1, 3)))
+            writer.writerow([movie_id, title, rng.randint(1920, 2020)])
+
+    # Zipf-like popularity: rank r is chosen with weight 1 / r^exponent
+    weights = itertools.accumulate(
+        1 / (rank ** popularity_exponent) for rank in range(1, people + 1))
+    cumulative = list(weights)
+    with open(os.path.join(directory, "stars.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["person_id", "movie_id"])
+        for movie_id in movie_ids:
+            size = cast_size(rng, cast_exponent, smallest_cast, largest_cast)
+            cast = set(rng.choices(person_ids, cum_weights=cumulative, k=size))
+            for person_id in cast:
+                writer.writerow([person_id, movie_id])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic degrees dataset")
+    parser.add_argument("directory")
+    parser.add_argument("--people", type=int, default=1000000)
+    parser.add_argument("--movies", type=int, default=500000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cast-exponent", type=float, default=2.2,
+                        help="power-law exponent of cast sizes (> 1)")
+    parser.add_argument("--popularity-exponent", type=float, default=0.8,
+                        help="Zipf exponent of how often each person is cast")
+    parser.add_argument("--smallest-cast", type=int, default=3)
+    parser.add_argument("--largest-cast", type=int, default=60)
+    args = parser.parse_args()
+    if args.cast_exponent <= 1:
+        parser.error("--cast-exponent must be greater than 1")
+
+    generate(args.directory, args.people, args.movies, args.seed,
+             args.cast_exponent, args.popularity_exponent,
+             args.smallest_cast, args.largest_cast)
+    print(f"Wrote {args.people} people and {args.movies} movies to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+import csv
+import multiprocessing
+import os
+from array import array
+from collections.abc import Mapping
+
+# Smaller graphs are projected in-process; pool startup would dominate
+PARALLEL_THRESHOLD = 10000
+
+
+class CompactGraph():
+    """
+    Person <-> movie graph with IMDB ids interned to dense integers.
+
+    Links are stored CSR-style: the movies of person i are
+    person_movies[person_offsets[i]:person_offsets[i + 1]], and the stars
+    of movie j are movie_people[movie_offsets[j]:movie_offsets[j + 1]].
+    """
+
+    def __init__(self):
+        self.person_ids = []
+        self.person_names = []
+        self.person_births = []
+        self.person_index = {}
+
+        self.movie_ids = []
+        self.movie_titles = []
+        self.movie_years = []
+        self.movie_index = {}
+
+        # Maps lowercase names to a person index, or a tuple of indices
+        # when the name is shared
+        self.name_index = {}
+
+        self.person_offsets = array("i", [0])
+        self.person_movies = array("i")
+        self.movie_offsets = array("i", [0])
+        self.movie_people = array("i")
+
+        # Connected component label of each person index
+        self.components = array("i")
+
+        # Optional person -> person co-star projection in CSR form, with
+        # one witness movie per edge; None until project_costars
+        self.costar_offsets = None
+        self.costar_people = None
+        self.costar_movies = None
+
+    @classmethod
+    def from_csv(cls, directory):
+        """
+        Load people, movies and stars CSV files into a compact graph.
+        """
+        graph = cls()
+
+        with open(f"{directory}/people.csv", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                graph.add_person(row["id"], row["name"], row["birth"])
+
+        with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                graph.add_movie(row["id"], row["title"], row["year"])
+
+        # Collect links as parallel integer arrays, skipping unknown ids
+        persons = array("i")
+        movies = array("i")
+        with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                try:
+                    person = graph.person_index[row["person_id"]]
+                    movie = graph.movie_index[row["movie_id"]]
+                except KeyError:
+                    continue
+                persons.append(person)
+                movies.append(movie)
+
+        graph.person_offsets, graph.person_movies = build_csr(
+            len(graph.person_ids), persons, movies)
+        graph.movie_offsets, graph.movie_people = build_csr(
+            len(graph.movie_ids), movies, persons)
+        graph.components = graph.label_components()
+        return graph
+
+    def build_indices(self):
+        """
+        Rebuilds the id and name lookup dictionaries from the id and
+        name lists, e.g. after loading them from a snapshot.
+        """
+        self.person_index = dict(zip(self.person_ids, range(len(self.person_ids))))
+        self.movie_index = dict(zip(self.movie_ids, range(len(self.movie_ids))))
+        self.name_index = {}
+        for index, name in enumerate(self.person_names):
+            self.index_name(name, index)
+
+    def add_person(self, person_id, name, birth):
+        """Interns a person and returns their index."""
+        index = len(self.person_ids)
+        self.person_ids.append(person_id)
+        self.person_names.append(name)
+        self.person_births.append(birth)
+        self.person_index[person_id] = index
+        self.index_name(name, index)
+        return index
+
+    def index_name(self, name, index):
+        """Records that person index goes by name."""
+        key = name.lower()
+        existing = self.name_index.get(key)
+        if existing is None:
+            self.name_index[key] = index
+        elif isinstance(existing, tuple):
+            self.name_index[key] = existing + (index,)
+        else:
+            self.name_index[key] = (existing, index)
+
+    def add_movie(self, movie_id, title, year):
+        """Interns a movie and returns its index."""
+        index = len(self.movie_ids)
+        self.movie_ids.append(movie_id)
+        self.movie_titles.append(title)
+        self.movie_years.append(year)
+        self.movie_index[movie_id] = index
+        return index
+
+    def movies_of(self, person):
+        """Returns the movie indices a person index starred in."""
+        offsets = self.person_offsets
+        return self.person_movies[offsets[person]:offsets[person + 1]]
+
+    def stars_of(self, movie):
+        """Returns the person indices that starred in a movie index."""
+        offsets = self.movie_offsets
+        return self.movie_people[offsets[movie]:offsets[movie + 1]]
+
+    def label_components(self):
+        """
+        Returns an array labelling each person index with the root of its
+        connected component, found by union-find over each movie's cast.
+        """
+        count = len(self.person_ids)
+        parent = array("i", range(count))
+        size = array("i", [1]) * count
+        for movie in range(len(self.movie_ids)):
+            stars = self.stars_of(movie)
+            for star in stars[1:]:
+                union(parent, size, stars[0], star)
+        return array("i", [find(parent, person) for person in range(count)])
+
+    def neighbors(self, person):
+        """
+        Returns (movie, person) index pairs for people
+        who starred with a given person index.
+        """
+        movie_offsets = self.movie_offsets
+        movie_people = self.movie_people
+        neighbors = []
+        for movie in self.movies_of(person):
+            for star in movie_people[movie_offsets[movie]:movie_offsets[movie + 1]]:
+                neighbors.append((movie, star))
+        return neighbors
+
+    def costars(self, person):
+        """
+        Returns (movie, person) index pairs from the co-star projection:
+        each co-star once, with one movie they share.
+        """
+        start = self.costar_offsets[person]
+        end = self.costar_offsets[person + 1]
+        return zip(self.costar_movies[start:end], self.costar_people[start:end])
+
+    def search_neighbors(self):
+        """
+        Returns the fastest neighbors(person) function available for
+        searches: the co-star projection if built, else neighbors.
+        """
+        return self.neighbors if self.costar_offsets is None else self.costars
+
+    def project_costars(self, processes=None):
+        """
+        Builds the deduplicated co-star projection, splitting people
+        into chunks across a multiprocessing pool.
+        """
+        count = len(self.person_ids)
+        arrays = (self.person_offsets, self.person_movies,
+                  self.movie_offsets, self.movie_people)
+        processes = processes or os.cpu_count() or 1
+        chunk = max(1, -(-count // (processes * 8)))
+        chunks = [(start, min(start + chunk, count)) for start in range(0, count, chunk)]
+
+        if processes == 1 or count < PARALLEL_THRESHOLD:
+            init_projection(*arrays)
+            projection = merge_chunks(map(project_chunk, chunks))
+        else:
+            # Forked workers inherit the arrays; spawned ones need copies
+            if "fork" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("fork")
+            else:
+                context = multiprocessing.get_context()
+                arrays = tuple(array("i", values) for values in arrays)
+            with context.Pool(processes, init_projection, arrays) as pool:
+                projection = merge_chunks(pool.imap(project_chunk, chunks))
+
+        self.costar_offsets, self.costar_people, self.costar_movies = projection
+
+
+# Graph arrays for project_chunk, set per worker by init_projection
+projection_arrays = None
+
+
+def init_projection(person_offsets, person_movies, movie_offsets, movie_people):
+    """Hands the CSR arrays to a projection worker."""
+    global projection_arrays
+    projection_arrays = (person_offsets, person_movies, movie_offsets, movie_people)
+
+
+def project_chunk(bounds):
+    """
+    Computes co-stars for person indices in [start, end). Returns
+    per-person co-star counts and flat co-star and witness movie arrays.
+    """
+    person_offsets, person_movies, movie_offsets, movie_people = projection_arrays
+    sizes = array("i")
+    people = array("i")
+    movies = array("i")
+    for person in range(*bounds):
+        witness = {}
+        for movie in person_movies[person_offsets[person]:person_offsets[person + 1]]:
+            for star in movie_people[movie_offsets[movie]:movie_offsets[movie + 1]]:
+                if star not in witness:
+                    witness[star] = movie
+        witness.pop(person, None)
+        sizes.append(len(witness))
+        for star in sorted(witness):
+            people.append(star)
+            movies.append(witness[star])
+    return sizes, people, movies
+
+
+def merge_chunks(results):
+    """
+    Concatenates project_chunk results, in order, into CSR offset,
+    co-star and witness movie arrays.
+    """
+    offsets = array("i", [0])
+    people = array("i")
+    movies = array("i")
+    for sizes, chunk_people, chunk_movies in results:
+        for size in sizes:
+            offsets.append(offsets[-1] + size)
+        people.extend(chunk_people)
+        movies.extend(chunk_movies)
+    return offsets, people, movies
+
+
+def build_csr(count, rows, cols):
+    """
+    Groups parallel rows/cols arrays into CSR offset and index arrays
+    with `count` rows, dropping duplicate entries within a row.
+    """
+    offsets = array("i", bytes(4 * (count + 1)))
+    for row in rows:
+        offsets[row + 1] += 1
+    for i in range(count):
+        offsets[i + 1] += offsets[i]
+
+    indices = array("i", bytes(4 * len(rows)))
+    cursor = offsets[:-1]
+    for row, col in zip(rows, cols):
+        indices[cursor[row]] = col
+        cursor[row] += 1
+
+    # Sort each row and drop duplicate links, compacting in place
+    write = 0
+    start = 0
+    for i in range(count):
+        end = offsets[i + 1]
+        row = sorted(set(indices[start:end]))
+        indices[write:write + len(row)] = array("i", row)
+        offsets[i] = write
+        write += len(row)
+        start = end
+    offsets[count] = write
+    del indices[write:]
+    return offsets, indices
+
+
+def find(parent, x):
+    """
+    Returns the root of x in a union-find parent mapping, halving the
+    path on the way. parent may be a dict or a list-like of indices.
+    """
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]
+        x = parent[x]
+    return x
+
+
+def union(parent, size, a, b):
+    """
+    Merges the sets containing a and b, attaching the smaller tree
+    under the larger.
+    """
+    a = find(parent, a)
+    b = find(parent, b)
+    if a == b:
+        return
+    if size[a] < size[b]:
+        a, b = b, a
+    parent[b] = a
+    size[a] += size[b]
+
+
+class PeopleView(Mapping):
+    """
+    Read-only view of a CompactGraph with the same shape as the
+    `people` dictionary: person_id -> {name, birth, movies}.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, person_id):
+        graph = self.graph
+        person = graph.person_index[person_id]
+        return {
+            "name": graph.person_names[person],
+            "birth": graph.person_births[person],
+            "movies": {graph.movie_ids[movie] for movie in graph.movies_of(person)}
+        }
+
+    def __iter__(self):
+        return iter(self.graph.person_ids)
+
+    def __len__(self):
+        return len(self.graph.person_ids)
+
+    def __contains__(self, person_id):
+        return person_id in self.graph.person_index
+
+
+class MoviesView(Mapping):
+    """
+    Read-only view of a CompactGraph with the same shape as the
+    `movies` dictionary: movie_id -> {title, year, stars}.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, movie_id):
+        graph = self.graph
+        movie = graph.movie_index[movie_id]
+        return {
+            "title": graph.movie_titles[movie],
+            "year": graph.movie_years[movie],
+            "stars": {graph.person_ids[person] for person in graph.stars_of(movie)}
+        }
+
+    def __iter__(self):
+        return iter(self.graph.movie_ids)
+
+    def __len__(self):
+        return len(self.graph.movie_ids)
+
+    def __contains__(self, movie_id):
+        return movie_id in self.graph.movie_index
+
+
+class NamesView(Mapping):
+    """
+    Read-only view of a CompactGraph with the same shape as the
+    `names` dictionary: lowercase name -> set of person_ids.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, name):
+        person = self.graph.name_index[name]
+        if isinstance(person, tuple):
+            return {self.graph.person_ids[i] for i in person}
+        return {self.graph.person_ids[person]}
+
+    def __iter__(self):
+        return iter(self.graph.name_index)
+
+    def __len__(self):
+        return len(self.graph.name_index)
+
+    def __contains__(self, name):
+        return name in self.graph.name_index
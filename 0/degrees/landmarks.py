@@ -0,0 +1,223 @@
+"""
+Landmark distance oracle (ALT) over a CompactGraph.
+
+For each of K landmark people, the BFS distance to every person is
+stored in a uint8 array (UNREACHABLE when in another component). By the
+triangle inequality, any landmark L bounds the distance between a and b:
+
+    |d(L, a) - d(L, b)| <= d(a, b) <= d(L, a) + d(L, b)
+"""
+
+import json
+import mmap
+import os
+from array import array
+
+# Distance value for people a landmark cannot reach
+UNREACHABLE = 255
+
+# Distances are clamped here; only lower bounds stay valid past it
+MAX_DISTANCE = 254
+
+# Bumped when the file layout or landmark selection changes
+VERSION = 2
+
+
+class Landmarks():
+
+    def __init__(self, people, distances):
+        # Person indices of the landmarks
+        self.people = list(people)
+
+        # distances[i][p] is the distance from landmark i to person p
+        self.distances = list(distances)
+
+    @classmethod
+    def build(cls, graph, k):
+        """
+        Picks k landmarks spread across graph, farthest-first from its
+        best-connected person, keeping the BFS run from each.
+        """
+        return cls(*pick_farthest(graph, k))
+
+    def bounds(self, a, b):
+        """
+        Returns (lower, upper) bounds on the distance between person
+        indices a and b. upper is None if no landmark reaches both.
+        """
+        lower = 0
+        upper = None
+        for distances in self.distances:
+            da = distances[a]
+            db = distances[b]
+            if da == UNREACHABLE or db == UNREACHABLE:
+                continue
+            if abs(da - db) > lower:
+                lower = abs(da - db)
+            if da < MAX_DISTANCE and db < MAX_DISTANCE:
+                if upper is None or da + db < upper:
+                    upper = da + db
+        return lower, upper
+
+    def heuristic(self, target):
+        """
+        Returns an admissible, consistent h(person) estimating the
+        distance from person index to target.
+        """
+        rows = [(distances, distances[target]) for distances in self.distances
+                if distances[target] != UNREACHABLE]
+
+        def h(person):
+            best = 0
+            for distances, dt in rows:
+                dp = distances[person]
+                if dp != UNREACHABLE:
+                    if dp - dt > best:
+                        best = dp - dt
+                    elif dt - dp > best:
+                        best = dt - dp
+            return best
+        return h
+
+    def save(self, path, key):
+        """
+        Writes the landmarks to path: a JSON header line followed by the
+        raw distance arrays.
+        """
+        header = {"version": VERSION, "key": key, "people": self.people,
+                  "count": len(self.distances[0]) if self.distances else 0}
+        temp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp, "wb") as f:
+                f.write(json.dumps(header).encode("utf-8") + b"\n")
+                for distances in self.distances:
+                    f.write(bytes(distances))
+            os.replace(temp, path)
+        finally:
+            if os.path.exists(temp):
+                os.remove(temp)
+
+    @classmethod
+    def load(cls, path, key):
+        """
+        Loads landmarks saved by save, memory-mapped where possible.
+        Returns None if path is missing, stale, or truncated or otherwise
+        inconsistent with its header.
+        """
+        try:
+            with open(path, "rb") as f:
+                header = json.loads(f.readline().decode("utf-8"))
+                if header["version"] != VERSION or header["key"] != key:
+                    return None
+                start = f.tell()
+                try:
+                    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError):
+                    f.seek(0)
+                    buffer = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+
+        view = memoryview(buffer)
+        try:
+            count = header["count"]
+            people = header["people"]
+            if (not isinstance(count, int) or not isinstance(people, list) or count < 0
+                    or start + len(people) * count != len(view)):
+                return None
+        except KeyError:
+            return None
+        distances = [view[start + i * count:start + (i + 1) * count]
+                     for i in range(len(people))]
+        return cls(people, distances)
+
+
+def pick_by_degree(graph, k):
+    """
+    Returns up to k person indices with the most co-star links, counted
+    as the total cast size of their movies.
+    """
+    movie_sizes = [graph.movie_offsets[movie + 1] - graph.movie_offsets[movie]
+                   for movie in range(len(graph.movie_ids))]
+    degree = [sum(movie_sizes[movie] for movie in graph.movies_of(person))
+              for person in range(len(graph.person_ids))]
+    return sorted(range(len(degree)), key=degree.__getitem__, reverse=True)[:k]
+
+
+def pick_farthest(graph, k):
+    """
+    Returns up to k landmark person indices and their distance arrays.
+    The first is the best-connected person; each next one is the person
+    in its component farthest from every landmark chosen so far, so the
+    landmarks sit on the periphery, where their bounds are tightest.
+    """
+    people = []
+    distances = []
+    if k < 1 or not graph.person_ids:
+        return people, distances
+    person = pick_by_degree(graph, 1)[0]
+
+    # Distance from each person to its nearest landmark
+    nearest = None
+    while True:
+        people.append(person)
+        distances.append(distances_from(graph, person))
+        if nearest is None:
+            nearest = array("B", distances[-1])
+        else:
+            for p, d in enumerate(distances[-1]):
+                if d < nearest[p]:
+                    nearest[p] = d
+        if len(people) == k:
+            break
+
+        # Only people the first landmark reaches are considered
+        person = max(range(len(nearest)),
+                     key=lambda p: nearest[p] if nearest[p] != UNREACHABLE else -1)
+        if nearest[person] in (0, UNREACHABLE):
+            break
+    return people, distances
+
+
+def distances_from(graph, source):
+    """
+    Returns a uint8 array of BFS distances from source to every person
+    index, clamped to MAX_DISTANCE.
+    """
+    distances = array("B", [UNREACHABLE]) * len(graph.person_ids)
+    distances[source] = 0
+    frontier = [source]
+    depth = 0
+    neighbors = graph.search_neighbors()
+    while frontier:
+        depth = min(depth + 1, MAX_DISTANCE)
+        next_frontier = []
+        for person in frontier:
+            for movie, neighbor in neighbors(person):
+                if distances[neighbor] == UNREACHABLE:
+                    distances[neighbor] = depth
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return distances
+
+
+def landmarks_path(directory, k):
+    """Returns where the landmarks for a data directory live."""
+    return os.path.join(directory, f"landmarks{k}.snapshot")
+
+
+def load_landmarks(graph, directory, k, key):
+    """
+    Returns the k landmarks for graph, loading them from the data
+    directory when current and otherwise building and saving them.
+    """
+    path = landmarks_path(directory, k)
+    landmarks = Landmarks.load(path, key)
+    if landmarks is None:
+        landmarks = Landmarks.build(graph, k)
+        try:
+            landmarks.save(path, key)
+        except OSError:
+            # Read-only data directories just rebuild them next time
+            pass
+    return landmarks
@@ -0,0 +1,254 @@
+"""
+Long-running degrees of separation query server.
+
+Loads the data once, then answers JSON-lines queries on stdin, a TCP
+port or a Unix socket. Each line is one of
+
+    {"source": "Kevin Bacon", "target": "Tom Cruise"}
+    {"stats": true}
+
+where source and target are names or IMDB person ids. Full BFS trees
+are kept per source person in a bounded LRU cache, so repeated queries
+from the same source only walk the cached tree.
+
+The first query from a source runs a BFS over that person's whole
+connected component, which on the large dataset takes seconds rather
+than the milliseconds of a targeted search. With the compact backend
+each tree is two flat int arrays, 8 bytes per person in the graph, so
+the cache holds at most cache_size * 8 * people bytes. The dict backend
+stores trees as dictionaries, which cost well over 100 bytes per reached
+person; keep its cache small.
+"""
+
+import argparse
+import json
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+import degrees
+
+
+class QueryServer():
+
+    def __init__(self, cache_size=16, window=10000):
+        # Trees by source state, least recently used first
+        self.trees = OrderedDict()
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+
+        # Futures of trees being built, so concurrent queries from one
+        # source wait for a single build
+        self.building = {}
+
+        self.latencies = deque(maxlen=window)
+        self.queries = 0
+
+        # Guards the cache and counters only; trees are built and
+        # queries answered outside it
+        self.lock = threading.Lock()
+
+    def build_tree(self, source):
+        """
+        Returns the BFS tree rooted at a search state: a FlatTree with
+        the compact backend, else a dictionary.
+        """
+        if degrees.graph is None:
+            return degrees.bfs_tree(source, degrees.state_neighbors())
+        return degrees.bfs_flat_tree(source, degrees.state_neighbors(),
+                                     len(degrees.graph.person_ids))
+
+    def tree(self, source):
+        """
+        Returns (tree, cached) for a source state, building the tree on a
+        miss. Queries from a source whose tree another thread is already
+        building wait for that build and count as hits.
+        """
+        with self.lock:
+            tree = self.trees.get(source)
+            if tree is not None:
+                self.trees.move_to_end(source)
+                self.hits += 1
+                return tree, True
+            pending = self.building.get(source)
+            building = pending is None
+            if building:
+                pending = self.building[source] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+        if not building:
+            return pending.result(), True
+
+        try:
+            tree = self.build_tree(source)
+        except BaseException as e:
+            with self.lock:
+                del self.building[source]
+            pending.set_exception(e)
+            raise
+        with self.lock:
+            del self.building[source]
+            self.trees[source] = tree
+            while len(self.trees) > self.cache_size:
+                self.trees.popitem(last=False)
+        pending.set_result(tree)
+        return tree, False
+
+    def handle(self, line):
+        """Answers one JSON query line, returning a JSON-serializable dict."""
+        try:
+            query = json.loads(line)
+        except json.JSONDecodeError as e:
+            return {"error": f"invalid JSON: {e}"}
+        if not isinstance(query, dict):
+            return {"error": "query must be a JSON object"}
+        if query.get("stats"):
+            return self.stats()
+
+        start = time.perf_counter()
+        try:
+            response = self.answer(query)
+        except LookupError as e:
+            return {"error": str(e.args[0])}
+        latency = time.perf_counter() - start
+        with self.lock:
+            self.queries += 1
+            self.latencies.append(latency)
+        response["latency_ms"] = round(latency * 1000, 3)
+        return response
+
+    def answer(self, query):
+        """Resolves a source/target query to a path."""
+        source = degrees.resolve_person(query.get("source"))
+        target = degrees.resolve_person(query.get("target"))
+        response = {"source": source, "target": target, "cached": False}
+
+        if not degrees.connected(source, target):
+            path = None
+        else:
+            tree, response["cached"] = self.tree(degrees.person_state(source))
+            path = degrees.decode_path(
+                degrees.tree_path(tree, degrees.person_state(target)))
+
+        if path is None:
+            response["degrees"] = None
+            response["path"] = None
+        else:
+            response["degrees"] = len(path)
+            response["path"] = [
+                {"movie_id": movie_id,
+                 "title": degrees.movies[movie_id]["title"],
+                 "person_id": person_id,
+                 "name": degrees.people[person_id]["name"]}
+                for movie_id, person_id in path
+            ]
+        return response
+
+    def stats(self):
+        """Returns cache hit rates and latency percentiles."""
+        with self.lock:
+            hits, misses, size = self.hits, self.misses, len(self.trees)
+            queries = self.queries
+            latencies = sorted(self.latencies)
+        lookups = hits + misses
+
+        def percentile(p):
+            if not latencies:
+                return None
+            index = min(len(latencies) - 1, int(p * len(latencies)))
+            return round(latencies[index] * 1000, 3)
+
+        return {
+            "queries": queries,
+            "cache": {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / lookups if lookups else None,
+                "size": size,
+                "max_size": self.cache_size
+            },
+            "latency_ms": {
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": percentile(1.0)
+            }
+        }
+
+
+def serve_stream(server, infile, outfile):
+    """Answers queries from infile line by line until it is exhausted."""
+    for line in infile:
+        if not line.strip():
+            continue
+        outfile.write(json.dumps(server.handle(line)) + "\n")
+        outfile.flush()
+
+
+def make_handler(server):
+    """Returns a socketserver handler class bound to a QueryServer."""
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                response = server.handle(line.decode("utf-8"))
+                self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+    return Handler
+
+
+class ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Degrees of separation query server")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("--backend", choices=["dict", "compact"], default="compact",
+                        help="in-memory graph representation")
+    parser.add_argument("--projection", action="store_true",
+                        help="search a precomputed co-star projection (compact only)")
+    parser.add_argument("--cache-size", type=int, default=16,
+                        help="number of per-source BFS trees to keep "
+                             "(compact: 8 bytes per person each)")
+    listen = parser.add_mutually_exclusive_group()
+    listen.add_argument("--tcp", metavar="HOST:PORT",
+                        help="listen on a TCP socket instead of stdin")
+    listen.add_argument("--unix", metavar="PATH",
+                        help="listen on a Unix socket instead of stdin")
+    args = parser.parse_args()
+
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(args.directory, args.backend, projection=args.projection)
+    print("Data loaded.", file=sys.stderr)
+
+    server = QueryServer(args.cache_size)
+    if args.tcp is None and args.unix is None:
+        serve_stream(server, sys.stdin, sys.stdout)
+        return
+
+    if args.tcp is not None:
+        host, _, port = args.tcp.rpartition(":")
+        listener = ThreadingTCPServer((host or "localhost", int(port)), make_handler(server))
+    else:
+        listener = ThreadingUnixServer(args.unix, make_handler(server))
+    with listener:
+        print(f"Serving on {listener.server_address}", file=sys.stderr)
+        try:
+            listener.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
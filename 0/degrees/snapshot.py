@@ -0,0 +1,210 @@
+"""
+Binary snapshots of a parsed CompactGraph, stored next to the CSV files.
+
+A snapshot is MAGIC, an 8 byte little-endian header length, a JSON
+header and then 8 byte aligned sections. Integer arrays are written raw
+and loaded as zero-copy memoryviews over an mmap of the file; string
+columns are NUL-separated UTF-8 text.
+"""
+
+import json
+import mmap
+import os
+import sys
+
+from graph import CompactGraph
+
+MAGIC = b"DEGSNAP\0"
+
+# Bump whenever the layout or the set of sections changes
+VERSION = 2
+
+SNAPSHOT_NAME = "graph.snapshot"
+SOURCES = ("people.csv", "movies.csv", "stars.csv")
+
+ARRAY_FIELDS = ("person_offsets", "person_movies", "movie_offsets", "movie_people",
+                "components")
+# Arrays that are only present once computed, e.g. the co-star projection
+OPTIONAL_ARRAY_FIELDS = ("costar_offsets", "costar_people", "costar_movies")
+STRING_FIELDS = ("person_ids", "person_names", "person_births",
+                 "movie_ids", "movie_titles", "movie_years")
+
+
+def snapshot_path(directory):
+    """Returns where the snapshot for a data directory lives."""
+    return os.path.join(directory, SNAPSHOT_NAME)
+
+
+def source_key(directory):
+    """
+    Returns the cache key for a data directory: the size and
+    modification time of each CSV file.
+    """
+    key = []
+    for name in SOURCES:
+        stat = os.stat(os.path.join(directory, name))
+        key.append([name, stat.st_size, stat.st_mtime_ns])
+    return key
+
+
+def save(graph, path, key):
+    """
+    Writes graph to a snapshot at path, tagged with key. The file is
+    written to a temporary name and moved into place atomically.
+    """
+    sections = []
+    for field in ARRAY_FIELDS + OPTIONAL_ARRAY_FIELDS:
+        values = getattr(graph, field)
+        if values is None:
+            continue
+        view = memoryview(values)
+        sections.append((field, view.format, len(view), view.tobytes()))
+    for field in STRING_FIELDS:
+        values = getattr(graph, field)
+        sections.append((field, "s", len(values), "\0".join(values).encode("utf-8")))
+
+    header = {
+        "version": VERSION,
+        "byteorder": sys.byteorder,
+        "key": key,
+        "sections": {}
+    }
+
+    # Lay sections out after a fixed-size header so offsets are known
+    # before the header itself is serialized
+    offset = 0
+    for field, typecode, count, data in sections:
+        header["sections"][field] = [offset, len(data), typecode, count]
+        offset += align(len(data))
+    encoded = json.dumps(header).encode("utf-8")
+    start = align(len(MAGIC) + 8 + len(encoded))
+
+    temp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(encoded).to_bytes(8, "little"))
+            f.write(encoded)
+            f.write(bytes(start - f.tell()))
+            for field, typecode, count, data in sections:
+                f.write(data)
+                f.write(bytes(align(len(data)) - len(data)))
+        os.replace(temp, path)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def load(path, key):
+    """
+    Loads a snapshot from path. Returns None if it is missing, was
+    written by another version or platform, does not match key, or is
+    truncated or otherwise inconsistent with its header.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            length = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(length).decode("utf-8"))
+            if (header["version"] != VERSION
+                    or header["byteorder"] != sys.byteorder
+                    or header["key"] != key):
+                return None
+            start = align(len(MAGIC) + 8 + length)
+
+            # Map the file where possible so arrays are paged in lazily
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                f.seek(0)
+                buffer = f.read()
+    except (OSError, ValueError, KeyError):
+        return None
+
+    view = memoryview(buffer)
+    graph = CompactGraph()
+    sections = header["sections"]
+    if not isinstance(sections, dict) or not set(ARRAY_FIELDS + STRING_FIELDS) <= set(sections):
+        return None
+    try:
+        for field, (offset, size, typecode, count) in sections.items():
+            if field not in ARRAY_FIELDS + OPTIONAL_ARRAY_FIELDS + STRING_FIELDS:
+                return None
+            if offset < 0 or size < 0 or start + offset + size > len(view):
+                return None
+            data = view[start + offset:start + offset + size]
+            if len(data) != size:
+                return None
+            if typecode == "s":
+                values = str(data, "utf-8").split("\0") if count else []
+            else:
+                values = data.cast(typecode)
+            if len(values) != count:
+                return None
+            setattr(graph, field, values)
+    except (TypeError, ValueError):
+        return None
+    if not consistent(graph):
+        return None
+    graph.build_indices()
+    return graph
+
+
+def consistent(graph):
+    """
+    Returns True if the loaded arrays agree on the number of people and
+    movies, as a final guard against corrupt sections.
+    """
+    people = len(graph.person_ids)
+    movies = len(graph.movie_ids)
+    if (len(graph.person_names) != people or len(graph.person_births) != people
+            or len(graph.person_offsets) != people + 1 or len(graph.components) != people
+            or len(graph.movie_titles) != movies or len(graph.movie_years) != movies
+            or len(graph.movie_offsets) != movies + 1):
+        return False
+    costars = [getattr(graph, field) is not None for field in OPTIONAL_ARRAY_FIELDS]
+    if any(costars) and not all(costars):
+        return False
+    if graph.costar_offsets is not None and (
+            len(graph.costar_offsets) != people + 1
+            or graph.costar_offsets[people] != len(graph.costar_people)
+            or len(graph.costar_movies) != len(graph.costar_people)):
+        return False
+    return (graph.person_offsets[people] == len(graph.person_movies)
+            and graph.movie_offsets[movies] == len(graph.movie_people))
+
+
+def load_graph(directory, projection=False):
+    """
+    Returns the CompactGraph for directory, from its snapshot when that
+    is current and otherwise by parsing the CSVs and writing a new one.
+
+    With projection=True the co-star projection is built too, and the
+    snapshot rewritten to include it, if it is not cached yet. With
+    projection=False a cached projection is left out of the returned
+    graph, so only the caller's flag decides what searches run over.
+    """
+    key = source_key(directory)
+    path = snapshot_path(directory)
+    graph = load(path, key)
+    stale = graph is None
+    if stale:
+        graph = CompactGraph.from_csv(directory)
+    if projection and graph.costar_offsets is None:
+        graph.project_costars()
+        stale = True
+    if stale:
+        try:
+            save(graph, path, key)
+        except OSError:
+            # Read-only data directories just go without a cache
+            pass
+    if not projection:
+        graph.costar_offsets = graph.costar_people = graph.costar_movies = None
+    return graph
+
+
+def align(size):
+    """Rounds size up to a multiple of 8."""
+    return (size + 7) & ~7
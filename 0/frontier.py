@@ -0,0 +1,118 @@
+"""
+Search frontiers shared by the lecture 0 search programs.
+
+Every frontier keeps an index of the states it holds, so contains_state
+is O(1), and queue-like frontiers are backed by collections.deque.
+"""
+
+import heapq
+import itertools
+from collections import deque
+
+
+class Node():
+    def __init__(self, state, parent, action):
+        self.state = state
+        self.parent = parent
+        self.action = action
+
+
+class StackFrontier():
+    def __init__(self):
+        self.frontier = deque()
+
+        # Maps each state in the frontier to the number of nodes holding it
+        self.states = {}
+
+    def __len__(self):
+        return len(self.frontier)
+
+    def add(self, node):
+        self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier.pop()
+            self.forget(node.state)
+            return node
+
+    def forget(self, state):
+        """Drops one reference to state from the state index."""
+        count = self.states[state]
+        if count == 1:
+            del self.states[state]
+        else:
+            self.states[state] = count - 1
+
+
+class QueueFrontier(StackFrontier):
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier.popleft()
+            self.forget(node.state)
+            return node
+
+
+class PriorityFrontier():
+    """
+    Frontier that removes the node with the lowest priority first, ties
+    broken in insertion order. Adding a state that is already present
+    with a lower priority replaces its node (decrease-key).
+    """
+
+    def __init__(self):
+        self.heap = []
+
+        # Maps each state to its live [priority, count, node] heap entry;
+        # replaced entries stay in the heap with node set to None
+        self.entries = {}
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, node, priority):
+        """
+        Adds node with the given priority. Returns False, leaving the
+        frontier unchanged, if its state is already present with an
+        equal or lower priority.
+        """
+        entry = self.entries.get(node.state)
+        if entry is not None:
+            if priority >= entry[0]:
+                return False
+            entry[2] = None
+        entry = [priority, next(self.counter), node]
+        self.entries[node.state] = entry
+        heapq.heappush(self.heap, entry)
+        return True
+
+    def contains_state(self, state):
+        return state in self.entries
+
+    def priority(self, state):
+        """Returns the priority state is queued with."""
+        return self.entries[state][0]
+
+    def empty(self):
+        return len(self.entries) == 0
+
+    def remove(self):
+        while self.heap:
+            _, _, node = heapq.heappop(self.heap)
+            if node is not None:
+                del self.entries[node.state]
+                return node
+        raise Exception("empty frontier")
@@ -0,0 +1,154 @@
+"""
+Batch maze solving.
+
+Solves every maze file in a directory or glob across a process pool
+and reports the path length, states explored and solve time of each
+one as CSV or JSON. Images are rendered only when --images is given.
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from maze import Maze, STRATEGIES
+
+FIELDS = ["file", "strategy", "path_length", "num_explored", "time_s", "image", "error"]
+
+
+def is_maze(filename):
+    """
+    Returns True if filename looks like a maze: text with exactly one
+    start "A" and one goal "B".
+    """
+    try:
+        with open(filename) as f:
+            contents = f.read()
+    except (OSError, UnicodeDecodeError):
+        return False
+    return contents.count("A") == 1 and contents.count("B") == 1
+
+
+def find_mazes(patterns):
+    """
+    Returns the sorted maze files named by patterns, each a file, a
+    directory (its .txt files) or a glob. Files matched by a directory
+    or glob are skipped unless they look like mazes; files named
+    explicitly are always kept, so their errors are reported.
+    """
+    files = set()
+    for pattern in patterns:
+        if os.path.isfile(pattern):
+            files.add(pattern)
+            continue
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "*.txt"))
+        else:
+            matches = glob.glob(pattern)
+        files.update(path for path in matches if os.path.isfile(path) and is_maze(path))
+    return sorted(files)
+
+
+def image_names(files, directory):
+    """
+    Returns a unique image path in directory for each maze file, named
+    after its path relative to the files' common directory, with path
+    separators replaced by "__" and the extension kept, so a/maze.txt,
+    b/maze.txt and a/maze.dat never share an image.
+    """
+    absolute = [os.path.abspath(filename) for filename in files]
+    root = os.path.commonpath([os.path.dirname(path) for path in absolute])
+    return [os.path.join(directory, os.path.relpath(path, root).replace(os.sep, "__") + ".png")
+            for path in absolute]
+
+
+def solve_file(filename, strategy, image=None, show_explored=False):
+    """
+    Solves one maze file, rendering it to the image path if given.
+    Returns a result row; failures are reported in its error field.
+    """
+    row = dict.fromkeys(FIELDS)
+    row["file"] = filename
+    row["strategy"] = strategy
+    try:
+        m = Maze(filename, bitmap=(strategy == "wavefront"))
+        try:
+            m.solve(strategy)
+        except Exception as e:
+            row["error"] = str(e)
+        stats = m.stats.get(strategy, {})
+        row["path_length"] = stats.get("path_length")
+        row["num_explored"] = stats.get("num_explored")
+        row["time_s"] = stats.get("time")
+        if image is not None:
+            row["image"] = image
+            m.output_image(image, show_explored=show_explored)
+    except Exception as e:
+        row["error"] = str(e)
+    return row
+
+
+def write_results(rows, out, output_format):
+    """Writes result rows to out as CSV or JSON."""
+    if output_format == "json":
+        json.dump(rows, out, indent=2)
+        out.write("\n")
+        return
+    writer = csv.DictWriter(out, FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({field: "" if value is None else value
+                         for field, value in row.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve many mazes in parallel")
+    parser.add_argument("mazes", nargs="+",
+                        help="maze files, directories of .txt mazes or globs")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="bfs")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="process pool size (default: CPU count)")
+    parser.add_argument("--format", choices=["csv", "json"], default=None,
+                        help="output format (default: from --output, else csv)")
+    parser.add_argument("--output", help="write results here instead of stdout")
+    parser.add_argument("--images", metavar="DIRECTORY",
+                        help="render each solved maze into this directory")
+    parser.add_argument("--show-explored", action="store_true",
+                        help="shade explored cells in rendered images")
+    args = parser.parse_args()
+
+    output_format = args.format
+    if output_format is None:
+        output_format = "json" if args.output and args.output.endswith(".json") else "csv"
+
+    files = find_mazes(args.mazes)
+    if not files:
+        sys.exit("No maze files found.")
+    images = [None] * len(files)
+    if args.images is not None:
+        os.makedirs(args.images, exist_ok=True)
+        images = image_names(files, args.images)
+    print(f"Solving {len(files)} mazes with {args.strategy}...", file=sys.stderr)
+
+    with ProcessPoolExecutor(args.workers) as pool:
+        futures = [pool.submit(solve_file, filename, args.strategy,
+                               image, args.show_explored)
+                   for filename, image in zip(files, images)]
+        rows = [future.result() for future in futures]
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        write_results(rows, out, output_format)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    failed = sum(row["error"] is not None for row in rows)
+    print(f"Solved {len(rows) - failed} of {len(rows)} mazes.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
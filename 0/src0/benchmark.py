@@ -0,0 +1,105 @@
+"""
+Benchmarks every maze solving strategy over generated mazes.
+
+For each algorithm and size in the sweep, a seeded maze is generated
+and solved with each strategy. Wall time is the best of several untraced
+runs; peak memory comes from a separate run under tracemalloc, since
+tracing slows the solve down. Results are written as JSON.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from maze import Maze, STRATEGIES
+from generate import ALGORITHMS, generate, write_maze
+
+
+def available_strategies():
+    """Returns STRATEGIES, without wavefront when NumPy is missing."""
+    try:
+        import numpy
+    except ImportError:
+        return tuple(strategy for strategy in STRATEGIES if strategy != "wavefront")
+    return STRATEGIES
+
+
+def run_strategy(filename, strategy, repeat):
+    """Solves a maze file with one strategy, returning its measurements."""
+    bitmap = strategy == "wavefront"
+    times = []
+    for _ in range(repeat):
+        m = Maze(filename, bitmap=bitmap)
+        start = time.perf_counter()
+        m.solve(strategy)
+        times.append(time.perf_counter() - start)
+
+    m = Maze(filename, bitmap=bitmap)
+    tracemalloc.start()
+    try:
+        m.solve(strategy)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "strategy": strategy,
+        "path_length": len(m.solution[1]),
+        "num_explored": m.num_explored,
+        "time_s": min(times),
+        "peak_memory_bytes": peak
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark maze solving strategies")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[51, 101, 201, 401],
+                        help="maze side lengths to sweep")
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS,
+                        default=list(ALGORITHMS))
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=None,
+                        help="default: every strategy whose dependencies are installed")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="untraced runs per strategy; the best time is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark.json")
+    args = parser.parse_args()
+    strategies = args.strategies or available_strategies()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for algorithm in args.algorithms:
+            for size in args.sizes:
+                filename = os.path.join(directory, f"{algorithm}{size}.txt")
+                write_maze(filename, generate(algorithm, size, size, args.seed))
+                print(f"{algorithm} {size}x{size}", file=sys.stderr)
+                for strategy in strategies:
+                    result = run_strategy(filename, strategy, args.repeat)
+                    result.update(algorithm=algorithm, size=size)
+                    results.append(result)
+                    print(f"    {strategy:<10} explored {result['num_explored']:>8}  "
+                          f"length {result['path_length']:>6}  "
+                          f"{result['time_s'] * 1000:>9.2f} ms  "
+                          f"{result['peak_memory_bytes'] / 2 ** 20:>7.2f} MiB",
+                          file=sys.stderr)
+
+    report = {
+        "sizes": args.sizes,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "python": sys.version,
+        "platform": platform.platform(),
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
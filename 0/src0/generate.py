@@ -0,0 +1,149 @@
+"""
+Generates random mazes in the text format maze.py reads.
+
+Algorithms:
+    backtracker  recursive backtracker (depth-first carving); long corridors
+    prim         randomized Prim's; many short dead ends
+    rooms        an open room with randomly scattered wall blocks
+
+Mazes are walled with "#", the start "A" is in the top-left corner and
+the goal "B" in the bottom-right one.
+"""
+
+import argparse
+import random
+from collections import deque
+
+ALGORITHMS = ("backtracker", "prim", "rooms")
+
+
+def empty_grid(height, width):
+    """Returns a height x width grid of walls."""
+    return [[True] * width for _ in range(height)]
+
+
+def carve_neighbors(grid, cell):
+    """Returns the uncarved cells two steps from cell, with the wall between."""
+    row, col = cell
+    result = []
+    for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2)):
+        r, c = row + dr, col + dc
+        if 0 < r < len(grid) - 1 and 0 < c < len(grid[0]) - 1 and grid[r][c]:
+            result.append(((r, c), (row + dr // 2, col + dc // 2)))
+    return result
+
+
+def backtracker(height, width, rng):
+    """Carves a perfect maze by randomized depth-first search."""
+    grid = empty_grid(height, width)
+    grid[1][1] = False
+    stack = [(1, 1)]
+    while stack:
+        candidates = carve_neighbors(grid, stack[-1])
+        if not candidates:
+            stack.pop()
+            continue
+        (r, c), (wr, wc) = rng.choice(candidates)
+        grid[wr][wc] = False
+        grid[r][c] = False
+        stack.append((r, c))
+    return grid
+
+
+def prim(height, width, rng):
+    """Carves a perfect maze with randomized Prim's algorithm."""
+    grid = empty_grid(height, width)
+    grid[1][1] = False
+    walls = carve_neighbors(grid, (1, 1))
+    while walls:
+        (r, c), (wr, wc) = walls.pop(rng.randrange(len(walls)))
+        if not grid[r][c]:
+            continue
+        grid[wr][wc] = False
+        grid[r][c] = False
+        walls.extend(carve_neighbors(grid, (r, c)))
+    return grid
+
+
+def connected(grid, start, goal):
+    """Returns whether goal can be reached from start."""
+    seen = {start}
+    frontier = deque([start])
+    while frontier:
+        row, col = frontier.popleft()
+        if (row, col) == goal:
+            return True
+        for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if not grid[r][c] and (r, c) not in seen:
+                seen.add((r, c))
+                frontier.append((r, c))
+    return False
+
+
+def rooms(height, width, rng, density=0.25):
+    """
+    Returns an open room with about density of its interior covered by
+    random wall blocks, redrawing until the corners are connected.
+    """
+    start, goal = (1, 1), (height - 2, width - 2)
+    while True:
+        grid = empty_grid(height, width)
+        for row in range(1, height - 1):
+            for col in range(1, width - 1):
+                grid[row][col] = rng.random() < density
+        grid[start[0]][start[1]] = False
+        grid[goal[0]][goal[1]] = False
+        if connected(grid, start, goal):
+            return grid
+
+
+def generate(algorithm, height, width, seed=0):
+    """
+    Returns a maze as a list of text lines. Perfect mazes need odd
+    dimensions, so even sizes are rounded up.
+    """
+    if height < 3 or width < 3:
+        raise ValueError("mazes must be at least 3x3")
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {algorithm!r}")
+    height += 1 - height % 2
+    width += 1 - width % 2
+    rng = random.Random(seed)
+    if algorithm == "backtracker":
+        grid = backtracker(height, width, rng)
+    elif algorithm == "prim":
+        grid = prim(height, width, rng)
+    else:
+        grid = rooms(height, width, rng)
+
+    lines = [["#" if wall else " " for wall in row] for row in grid]
+    lines[1][1] = "A"
+    lines[height - 2][width - 2] = "B"
+    return ["".join(line) for line in lines]
+
+
+def write_maze(filename, lines):
+    """Writes maze lines to filename."""
+    with open(filename, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a random maze")
+    parser.add_argument("output", help="maze file to write")
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="backtracker")
+    parser.add_argument("--height", type=int, default=21)
+    parser.add_argument("--width", type=int, default=41)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        lines = generate(args.algorithm, args.height, args.width, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    write_maze(args.output, lines)
+    print(f"Wrote {len(lines)}x{len(lines[0])} {args.algorithm} maze to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
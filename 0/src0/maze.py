@@ -1,47 +1,33 @@
+import heapq
+import os
 import sys
+import time
+from array import array
+from collections import deque
 
-class Node():
-    def __init__(self, state, parent, action):
-        self.state = state
-        self.parent = parent
-        self.action = action
+# Frontiers live in the shared lecture 0 library, one directory up
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
+from frontier import Node, PriorityFrontier
 
-class StackFrontier():
-    def __init__(self):
-        self.frontier = []
+# Search strategies Maze.solve accepts; the informed ones use a heap,
+# and wavefront is a vectorized BFS that needs NumPy
+STRATEGIES = ("dfs", "bfs", "greedy", "astar", "jps", "wavefront")
 
-    def add(self, node):
-        self.frontier.append(node)
+# Moves as (row, column) steps
+DIRECTIONS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
 
-    def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+# Per-cell states of the compact search, one byte each
+UNSEEN, QUEUED, EXPLORED = 0, 1, 2
 
-    def empty(self):
-        return len(self.frontier) == 0
-
-    def remove(self):
-        if self.empty():
-            raise Exception("empty frontier")
-        else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
-            return node
-
-
-class QueueFrontier(StackFrontier):
-
-    def remove(self):
-        if self.empty():
-            raise Exception("empty frontier")
-        else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
-            return node
 
 class Maze():
 
-    def __init__(self, filename):
+    def __init__(self, filename, bitmap=False):
+        """
+        Reads a maze from filename. With bitmap=True, walls are stored as
+        a NumPy bool array instead of a list of lists.
+        """
 
         # Read file and set height and width of maze
         with open(filename) as f:
@@ -58,6 +44,23 @@ class Maze():
         self.height = len(contents)
         self.width = max(len(line) for line in contents)
 
+        self.solution = None
+        self.explored = set()
+
+        # BFS distance of every cell after a wavefront solve, else None
+        self.distances = None
+
+        # Search state of every flat cell index after a compact search
+        # (UNSEEN, QUEUED or EXPLORED), else None
+        self.visited = None
+
+        # Maps each strategy solved with to its explored count and time
+        self.stats = {}
+
+        if bitmap:
+            self.read_bitmap(contents)
+            return
+
         # Keep track of walls
         self.walls = []
         for i in range(self.height):
@@ -78,7 +81,59 @@ class Maze():
                     row.append(False)
             self.walls.append(row)
 
-        self.solution = None
+
+    def read_bitmap(self, contents):
+        """Parses maze lines into a NumPy bool wall array."""
+        import numpy as np
+
+        # One code point per cell; short lines are padded with spaces
+        cells = np.full((self.height, self.width), ord(" "), dtype=np.uint32)
+        for i, line in enumerate(contents):
+            cells[i, :len(line)] = np.frombuffer(line.encode("utf-32-le"), dtype=np.uint32)
+
+        self.start = tuple(int(x) for x in np.argwhere(cells == ord("A"))[0])
+        self.goal = tuple(int(x) for x in np.argwhere(cells == ord("B"))[0])
+        self.walls = ((cells != ord(" ")) & (cells != ord("A"))
+                      & (cells != ord("B")))
+
+
+    @property
+    def explored(self):
+        """
+        Set of explored cells, built on first use after a compact search
+        or a wavefront solve.
+        """
+        if self.explored_cells is None:
+            if self.distances is not None:
+                rows, cols = (self.distances >= 0).nonzero()
+                self.explored_cells = set(zip(rows.tolist(), cols.tolist()))
+                self.explored_cells.discard(self.goal)
+            else:
+                self.explored_cells = {
+                    divmod(index, self.width)
+                    for index, status in enumerate(self.visited) if status == EXPLORED
+                }
+        return self.explored_cells
+
+    @explored.setter
+    def explored(self, cells):
+        self.explored_cells = cells
+
+
+    @property
+    def solution(self):
+        """
+        (actions, cells) from start to goal, or None. After a compact
+        search it is traced from the parent array on first use.
+        """
+        if self.solution_path is None and self.parents is not None:
+            self.solution_path = self.trace(self.parents, self.goal[0] * self.width + self.goal[1])
+        return self.solution_path
+
+    @solution.setter
+    def solution(self, solution):
+        self.solution_path = solution
+        self.parents = None
 
 
     def print(self):
@@ -116,114 +171,434 @@ class Maze():
         return result
 
 
-    def solve(self):
-        """Finds a solution to maze, if one exists."""
+    def heuristic(self, state):
+        """Manhattan distance from state to the goal."""
+        return abs(state[0] - self.goal[0]) + abs(state[1] - self.goal[1])
+
+
+    def solve(self, strategy="dfs"):
+        """
+        Finds a solution to maze, if one exists, using one of STRATEGIES:
+        depth-first, breadth-first, greedy best-first, A*, jump point
+        search or a vectorized wavefront BFS. Explored counts are
+        comparable across strategies, except that jps counts jump points
+        and wavefront counts whole levels (see wavefront).
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown strategy {strategy!r}")
+        start_time = time.perf_counter()
+        try:
+            if strategy == "wavefront":
+                self.wavefront()
+            elif strategy == "jps":
+                self.jump_point_search()
+            else:
+                self.search(strategy)
+        finally:
+            self.stats[strategy] = {
+                "num_explored": self.num_explored,
+                "time": time.perf_counter() - start_time,
+                "path_length": (len(self.solution[1])
+                                if self.solution is not None else None)
+            }
+
+
+    def open_cells(self):
+        """Returns a bytearray holding 1 for each open cell, by flat index."""
+        if hasattr(self.walls, "tobytes"):
+            return bytearray((~self.walls).astype("uint8").tobytes())
+        return bytearray(not wall for row in self.walls for wall in row)
+
+
+    def search(self, strategy):
+        """
+        Runs the search loop for solve over flat cell indices
+        row * width + col. Parent pointers live in an array("i") and
+        frontier/explored flags in a bytearray, so no per-node objects
+        are allocated; solution and explored are built from them lazily.
+        """
 
         # Keep track of number of states explored
         self.num_explored = 0
+        self.solution = None
+        self.distances = None
+        self.explored = None
+
+        width = self.width
+        size = self.height * width
+        is_open = self.open_cells()
+        start = self.start[0] * width + self.start[1]
+        goal = self.goal[0] * width + self.goal[1]
+        goal_row, goal_col = self.goal
+
+        def heuristic(index):
+            row, col = divmod(index, width)
+            return abs(row - goal_row) + abs(col - goal_col)
+
+        parents = array("i", [-1]) * size
+        visited = bytearray(size)
+        self.visited = visited
+
+        # Path cost of each cell reached, for A*
+        cost = array("i", [-1]) * size if strategy == "astar" else None
+
+        # Initialize frontier to just the starting position; informed
+        # frontiers are heaps of (priority, -path cost, insertion count,
+        # index), so A* breaks f ties toward the deepest cell, as in
+        # degrees.astar (greedy leaves the cost at 0)
+        informed = strategy in ("greedy", "astar")
+        if informed:
+            frontier = [(heuristic(start), 0, 0, start)]
+            counter = 1
+        else:
+            frontier = deque([start])
+        visited[start] = QUEUED
+        if cost is not None:
+            cost[start] = 0
 
-        # Initialize frontier to just the starting position
-        start = Node(state=self.start, parent=None, action=None)
-        frontier = StackFrontier()
-        frontier.add(start)
+        # Keep looping until solution found
+        while frontier:
+
+            # Choose a cell from the frontier
+            if strategy == "dfs":
+                index = frontier.pop()
+            elif strategy == "bfs":
+                index = frontier.popleft()
+            else:
+                priority, _, _, index = heapq.heappop(frontier)
+
+                # Skip entries superseded by a cheaper path (decrease-key)
+                if visited[index] == EXPLORED or (
+                        cost is not None and priority != cost[index] + heuristic(index)):
+                    continue
+            self.num_explored += 1
 
-        # Initialize an empty explored set
-        self.explored = set()
+            # If cell is the goal, then we have a solution
+            if index == goal:
+                self.parents = parents
+                return
 
-        # Keep looping until solution found
+            # Mark cell as explored
+            visited[index] = EXPLORED
+
+            # Add neighbors to frontier, in up, down, left, right order
+            col = index % width
+            for neighbor, inside in (
+                    (index - width, index >= width),
+                    (index + width, index + width < size),
+                    (index - 1, col > 0),
+                    (index + 1, col < width - 1)):
+                if not inside or not is_open[neighbor] or visited[neighbor] == EXPLORED:
+                    continue
+                if cost is not None:
+                    step = cost[index] + 1
+                    if cost[neighbor] < 0 or step < cost[neighbor]:
+                        cost[neighbor] = step
+                        parents[neighbor] = index
+                        visited[neighbor] = QUEUED
+                        heapq.heappush(frontier, (step + heuristic(neighbor), -step,
+                                                  counter, neighbor))
+                        counter += 1
+                elif visited[neighbor] == UNSEEN:
+                    parents[neighbor] = index
+                    visited[neighbor] = QUEUED
+                    if informed:
+                        heapq.heappush(frontier, (heuristic(neighbor), 0, counter, neighbor))
+                        counter += 1
+                    else:
+                        frontier.append(neighbor)
+
+        # If nothing left in frontier, then no path
+        raise Exception("no solution")
+
+
+    def trace(self, parents, goal):
+        """
+        Follows parent pointers back from flat index goal, returning the
+        (actions, cells) solution.
+        """
+        width = self.width
+        # Horizontal moves first so up/down win if width is 1
+        names = {-1: "left", 1: "right", -width: "up", width: "down"}
+        actions = []
+        cells = []
+        index = goal
+        while parents[index] >= 0:
+            parent = parents[index]
+            actions.append(names[index - parent])
+            cells.append(divmod(index, width))
+            index = parent
+        actions.reverse()
+        cells.reverse()
+        return (actions, cells)
+
+
+    def open_cell(self, row, col):
+        """Returns True if (row, col) is inside the maze and not a wall."""
+        return 0 <= row < self.height and 0 <= col < self.width and not self.walls[row][col]
+
+
+    def jump_horizontal(self, row, col, dc):
+        """
+        Moves from (row, col) in column direction dc until reaching the
+        goal or a cell with a forced vertical neighbor, returning that cell,
+        or None on hitting a wall.
+        """
+        while True:
+            col += dc
+            if not self.open_cell(row, col):
+                return None
+            if (row, col) == self.goal:
+                return (row, col)
+
+            # Up or down is forced when the canonical vertical-first route
+            # to it, around the cell behind, is walled off
+            for dr in (-1, 1):
+                if self.open_cell(row + dr, col) and not self.open_cell(row + dr, col - dc):
+                    return (row, col)
+
+
+    def jump_vertical(self, row, col, dr):
+        """
+        Moves from (row, col) in row direction dr until reaching the goal
+        or a cell from which a horizontal jump succeeds, returning that
+        cell, or None on hitting a wall.
+        """
         while True:
+            row += dr
+            if not self.open_cell(row, col):
+                return None
+            if (row, col) == self.goal:
+                return (row, col)
+            if (self.jump_horizontal(row, col, -1) is not None
+                    or self.jump_horizontal(row, col, 1) is not None):
+                return (row, col)
+
+
+    def jump_point_search(self):
+        """
+        A* over jump points on the 4-connected grid. Canonical paths move
+        vertically first, then horizontally, turning back to vertical only
+        at forced neighbors, so straight runs of symmetric cells are
+        skipped instead of queued.
+        """
+        self.num_explored = 0
+        self.solution = None
+        self.distances = None
+        self.explored = set()
 
-            # If nothing left in frontier, then no path
+        start = Node(state=self.start, parent=None, action=None)
+        frontier = PriorityFrontier()
+        frontier.add(start, self.heuristic(self.start))
+        cost = {self.start: 0}
+
+        while True:
             if frontier.empty():
                 raise Exception("no solution")
-
-            # Choose a node from the frontier
             node = frontier.remove()
             self.num_explored += 1
 
-            # If node is the goal, then we have a solution
             if node.state == self.goal:
-                actions = []
-                cells = []
-                while node.parent is not None:
-                    actions.append(node.action)
-                    cells.append(node.state)
-                    node = node.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
+                self.solution = self.expand_jumps(node)
                 return
-
-            # Mark node as explored
             self.explored.add(node.state)
 
-            # Add neighbors to frontier
-            for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
-                    frontier.add(child)
+            row, col = node.state
+            if node.action is None:
+                directions = list(DIRECTIONS.values())
+            elif node.action[0] == 0:
+                # Horizontal: keep going, plus any forced vertical turns
+                dc = node.action[1]
+                directions = [node.action] + [
+                    (dr, 0) for dr in (-1, 1)
+                    if self.open_cell(row + dr, col) and not self.open_cell(row + dr, col - dc)
+                ]
+            else:
+                # Vertical: keep going or turn either way
+                directions = [node.action, (0, -1), (0, 1)]
+
+            for dr, dc in directions:
+                if dr == 0:
+                    jump = self.jump_horizontal(row, col, dc)
+                else:
+                    jump = self.jump_vertical(row, col, dr)
+                if jump is None or jump in self.explored:
+                    continue
+                step = cost[node.state] + abs(jump[0] - row) + abs(jump[1] - col)
+                if jump not in cost or step < cost[jump]:
+                    cost[jump] = step
+                    child = Node(state=jump, parent=node, action=(dr, dc))
+                    frontier.add(child, step + self.heuristic(jump))
+
+
+    def expand_jumps(self, node):
+        """
+        Expands a chain of jump point nodes into the (actions, cells)
+        solution, one cell per step.
+        """
+        names = {step: action for action, step in DIRECTIONS.items()}
+        actions = []
+        cells = []
+        while node.parent is not None:
+            (row, col), (dr, dc) = node.state, node.action
+            parent = node.parent.state
+            while (row, col) != parent:
+                actions.append(names[(dr, dc)])
+                cells.append((row, col))
+                row -= dr
+                col -= dc
+            node = node.parent
+        actions.reverse()
+        cells.reverse()
+        return (actions, cells)
+
+
+    def wavefront(self):
+        """
+        Breadth-first search over a NumPy wall bitmap, expanding the whole
+        frontier one level at a time with vectorized index arithmetic, then
+        walking back down the distance gradient from the goal.
+
+        num_explored counts the cells closer to the start than the goal,
+        plus the goal. That can be slightly lower than bfs, whose count
+        depends on the queue order within the goal's level.
+        """
+        import numpy as np
+
+        self.solution = None
+
+        # Surround the grid with walls so neighbor indices never wrap
+        width = self.width + 2
+        padded = np.ones((self.height + 2, width), dtype=bool)
+        padded[1:-1, 1:-1] = np.asarray(self.walls, dtype=bool)
+
+        # Open cells not yet reached, as one flat mask
+        unreached = ~padded.ravel()
+
+        # up, down, left, right as flat index offsets
+        moves = [("up", -width), ("down", width), ("left", -1), ("right", 1)]
+
+        distances = np.full(padded.size, -1, dtype=np.int32)
+        start = (self.start[0] + 1) * width + self.start[1] + 1
+        goal = (self.goal[0] + 1) * width + self.goal[1] + 1
+        distances[start] = 0
+        unreached[start] = False
+        frontier = np.array([start])
+        depth = 0
+        while frontier.size and unreached[goal]:
+            depth += 1
+
+            # Shift the frontier one way at a time; clearing the mask after
+            # each direction keeps the next frontier free of duplicates
+            shifted = []
+            for _, offset in moves:
+                candidates = frontier + offset
+                candidates = candidates[unreached[candidates]]
+                unreached[candidates] = False
+                shifted.append(candidates)
+            frontier = np.concatenate(shifted)
+            distances[frontier] = depth
+
+        # Count the goal's level as unexplored, apart from the goal itself.
+        # This is a lower bound on what bfs reports, since bfs also expands
+        # whichever goal-level cells it dequeues before the goal
+        if distances[goal] >= 0:
+            distances[frontier] = -1
+            distances[goal] = depth
+        self.distances = distances.reshape(padded.shape)[1:-1, 1:-1]
+        self.explored = None
+        self.num_explored = int(np.count_nonzero(self.distances >= 0))
+        if distances[goal] < 0:
+            raise Exception("no solution")
+
+        # Step from the goal to any neighbor one closer to the start
+        actions = []
+        cells = []
+        cell = goal
+        while cell != start:
+            for action, offset in moves:
+                if distances[cell - offset] == distances[cell] - 1:
+                    actions.append(action)
+                    cells.append(divmod(cell, width))
+                    cell -= offset
+                    break
+        actions.reverse()
+        cells.reverse()
+        self.solution = (actions, [(i - 1, j - 1) for i, j in cells])
 
 
     def output_image(self, filename, show_solution=True, show_explored=False):
-        from PIL import Image, ImageDraw
+        """
+        Renders the maze to an image file. Cells are classified into a
+        colour index array, scaled up with np.repeat and masked for borders,
+        then written as a paletted image, so the whole image is built with
+        a handful of array operations.
+        """
+        import numpy as np
+        from PIL import Image
         cell_size = 50
         cell_border = 2
 
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
-
+        # Colours in increasing precedence; later classes overwrite earlier
+        palette = np.array([
+            (237, 240, 252, 255),  # Empty cell
+            (212, 97, 85, 255),    # Explored
+            (220, 235, 113, 255),  # Solution
+            (0, 171, 28, 255),     # Goal
+            (255, 0, 0, 255),      # Start
+            (40, 40, 40, 255),     # Walls
+            (0, 0, 0, 255)         # Border
+        ], dtype=np.uint8)
+
+        classes = np.zeros((self.height, self.width), dtype=np.uint8)
         solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-
-                # Walls
-                if col:
-                    fill = (40, 40, 40)
-
-                # Start
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
-
-                # Goal
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
-
-                # Solution
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)
-
-                # Explored
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)
-
-                # Empty cell
-                else:
-                    fill = (237, 240, 252)
-
-                # Draw cell
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
-
-        img.save(filename)
-
-
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
-
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
+        if solution is not None and show_explored and self.explored:
+            rows, cols = zip(*self.explored)
+            classes[list(rows), list(cols)] = 1
+        if solution is not None and show_solution and solution:
+            rows, cols = zip(*solution)
+            classes[list(rows), list(cols)] = 2
+        classes[self.goal] = 3
+        classes[self.start] = 4
+        classes[np.asarray(self.walls, dtype=bool)] = 5
+
+        # Scale each cell up to a square, then paint the black borders
+        pixels = classes.repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+        offsets = np.arange(cell_size)
+        inside = (offsets >= cell_border) & (offsets <= cell_size - cell_border)
+        border = ~np.outer(np.tile(inside, self.height), np.tile(inside, self.width))
+        pixels[border] = 6
+
+        img = Image.fromarray(pixels, "P")
+        img.putpalette(palette.ravel().tolist(), "RGBA")
+        img.convert("RGBA").save(filename)
+
+
+def main():
+    if len(sys.argv) not in (2, 3) or (len(sys.argv) == 3 and sys.argv[2] not in STRATEGIES + ("compare",)):
+        sys.exit(f"Usage: python maze.py maze.txt [{'|'.join(STRATEGIES)}|compare]")
+
+    strategy = sys.argv[2] if len(sys.argv) == 3 else "dfs"
+    m = Maze(sys.argv[1], bitmap=(strategy == "wavefront"))
+
+    if strategy == "compare":
+        print(f"{'Strategy':<10}{'Explored':>10}{'Length':>10}{'Time (ms)':>12}")
+        for strategy in STRATEGIES:
+            m.solve(strategy)
+            stats = m.stats[strategy]
+            print(f"{strategy:<10}{stats['num_explored']:>10}"
+                  f"{stats['path_length']:>10}{stats['time'] * 1000:>12.2f}")
+        return
+
+    print("Maze:")
+    m.print()
+    print("Solving...")
+    m.solve(strategy)
+    print("States Explored:", m.num_explored)
+    print("Solution:")
+    m.print()
+    m.output_image("maze.png", show_explored=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Tic Tac Toe Player on bitboards
+
+Drop-in replacement for tictactoe.py: the public functions take and
+return the same nested-list boards, but internally X and O are each a
+9-bit integer with bit 3 * i + j set for an occupied cell (i, j). Wins
+are tested against precomputed line masks and moves are single bit
+operations, so minimax never copies or rescans a board.
+"""
+
+from tictactoe import X, O, EMPTY, initial_state
+
+# All nine cells occupied
+FULL = 0b111111111
+
+# Bit of each cell, with its (i, j) action
+MOVES = tuple((1 << (3 * i + j), (i, j)) for i in range(3) for j in range(3))
+
+# The 8 winning lines: rows, columns and diagonals
+LINES = (
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100
+)
+
+
+def encode(board):
+    """
+    Returns the (X, O) bitboards of a nested-list board.
+    """
+    xs = os = 0
+    for bit, (i, j) in MOVES:
+        if board[i][j] == X:
+            xs |= bit
+        elif board[i][j] == O:
+            os |= bit
+    return xs, os
+
+
+def decode(xs, os):
+    """
+    Returns the nested-list board of a pair of bitboards.
+    """
+    board = initial_state()
+    for bit, (i, j) in MOVES:
+        if xs & bit:
+            board[i][j] = X
+        elif os & bit:
+            board[i][j] = O
+    return board
+
+
+def has_line(bits):
+    """
+    Returns True if bits cover one of the winning lines.
+    """
+    for line in LINES:
+        if bits & line == line:
+            return True
+    return False
+
+
+def player(board):
+    """
+    Returns player who has the next turn on a board.
+    """
+    xs, os = encode(board)
+    return X if bin(xs).count("1") == bin(os).count("1") else O
+
+
+def actions(board):
+    """
+    Returns set of all possible actions (i, j) available on the board.
+    """
+    xs, os = encode(board)
+    return {action for bit, action in MOVES if not (xs | os) & bit}
+
+
+def result(board, action):
+    """
+    Returns the board that results from making move (i, j) on the board.
+    """
+    i, j = action
+    if not (0 <= i < 3 and 0 <= j < 3):
+        raise ValueError
+    xs, os = encode(board)
+    bit = 1 << (3 * i + j)
+    if (xs | os) & bit:
+        raise ValueError
+    if bin(xs).count("1") == bin(os).count("1"):
+        return decode(xs | bit, os)
+    return decode(xs, os | bit)
+
+
+def winner(board):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    xs, os = encode(board)
+    if has_line(xs):
+        return X
+    if has_line(os):
+        return O
+    return None
+
+
+def terminal(board):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    xs, os = encode(board)
+    return has_line(xs) or has_line(os) or xs | os == FULL
+
+
+def utility(board):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    xs, os = encode(board)
+    return board_utility(xs, os)
+
+
+def board_utility(xs, os):
+    """
+    Returns the utility of a pair of bitboards.
+    """
+    if has_line(xs):
+        return 1
+    if has_line(os):
+        return -1
+    return 0
+
+
+def minimax(board):
+    """
+    Returns the optimal action for the current player on the board.
+    """
+    xs, os = encode(board)
+    if has_line(xs) or has_line(os) or xs | os == FULL:
+        return None
+    if bin(xs).count("1") == bin(os).count("1"):
+        val, action = max_value(xs, os)
+    else:
+        val, action = min_value(xs, os)
+    return action
+
+
+def max_value(xs, os):
+    """
+    Returns the value for X to move on a pair of bitboards, and the
+    action that achieves it.
+    """
+    if has_line(os):
+        return -1, None
+    occupied = xs | os
+    if occupied == FULL:
+        return 0, None
+    value = -500
+    opt_action = None
+    for bit, action in MOVES:
+        if occupied & bit:
+            continue
+        val, act = min_value(xs | bit, os)
+        if val > value:
+            value = val
+            opt_action = action
+            if value == 1:
+                break
+    return value, opt_action
+
+
+def min_value(xs, os):
+    """
+    Returns the value for O to move on a pair of bitboards, and the
+    action that achieves it.
+    """
+    if has_line(xs):
+        return 1, None
+    occupied = xs | os
+    if occupied == FULL:
+        return 0, None
+    value = 500
+    opt_action = None
+    for bit, action in MOVES:
+        if occupied & bit:
+            continue
+        val, act = max_value(xs, os | bit)
+        if val < value:
+            value = val
+            opt_action = action
+            if value == -1:
+                break
+    return value, opt_action
@@ -0,0 +1,328 @@
+"""
+m,n,k-game Player
+
+Generalizes tictactoe.py to boards of m rows and n columns won by k in
+a row. Game.minimax runs an iterative-deepening negamax with alpha-beta
+pruning and killer-move/history ordering, scoring positions at the
+depth limit with an evaluation of open lines, and stops deepening when
+its per-move time budget runs out. Boards are the same nested lists of
+X, O and EMPTY, and the module-level functions play 3x3 tic-tac-toe,
+where the search always runs to the end of the game.
+"""
+
+import argparse
+import time
+
+from tictactoe import X, O, EMPTY
+
+# Score of a won position; wins found sooner score higher
+WIN = 10 ** 9
+
+# Killer moves remembered per ply
+KILLERS = 2
+
+# Nodes searched between clock checks; a power of two
+CHECK_INTERVAL = 16
+
+
+class Timeout(Exception):
+    pass
+
+
+class Game():
+
+    def __init__(self, m=3, n=3, k=3, time_limit=None):
+        """
+        Creates an m-row, n-column game won by k in a row. time_limit is
+        the default per-move search budget in seconds; None searches to
+        the end of the game.
+        """
+        if not 1 <= k <= max(m, n):
+            raise ValueError("k must fit on the board")
+        self.m = m
+        self.n = n
+        self.k = k
+        self.time_limit = time_limit
+
+        # Search state of the current minimax call
+        self.deadline = None
+        self.check_deadline = False
+        self.nodes = 0
+
+        # Every run of k cells in a row, column or diagonal, as flat
+        # indices i * n + j, and the runs through each cell
+        self.lines = []
+        for i in range(m):
+            for j in range(n):
+                for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    if 0 <= i + di * (k - 1) < m and 0 <= j + dj * (k - 1) < n:
+                        self.lines.append(tuple(
+                            (i + di * step) * n + j + dj * step for step in range(k)))
+        self.cell_lines = [[] for _ in range(m * n)]
+        for line in self.lines:
+            for cell in line:
+                self.cell_lines[cell].append(line)
+
+        # Open lines with c pieces of one player score weights[c]
+        self.weights = [0] + [4 ** c for c in range(k)]
+
+        # Cells nearer the centre are tried first among equals
+        center = ((m - 1) / 2, (n - 1) / 2)
+        self.centrality = [-(abs(cell // n - center[0]) + abs(cell % n - center[1]))
+                           for cell in range(m * n)]
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.n for _ in range(self.m)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        cells = [cell for row in board for cell in row]
+        return X if cells.count(X) == cells.count(O) else O
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return {(i, j) for i in range(self.m) for j in range(self.n)
+                if board[i][j] == EMPTY}
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if not (0 <= i < self.m and 0 <= j < self.n) or board[i][j] != EMPTY:
+            raise ValueError
+        res = [list(row) for row in board]
+        res[i][j] = self.player(board)
+        return res
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        cells = [cell for row in board for cell in row]
+        for line in self.lines:
+            first = cells[line[0]]
+            if first is not EMPTY and all(cells[cell] == first for cell in line):
+                return first
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return self.winner(board) is not None or all(
+            cell != EMPTY for row in board for cell in row)
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        win = self.winner(board)
+        if win == X:
+            return 1
+        if win == O:
+            return -1
+        return 0
+
+    def minimax(self, board, time_limit=None):
+        """
+        Returns the best action found for the current player on the
+        board within time_limit seconds (default: the game's), searching
+        one ply deeper per iteration. The first iteration always
+        completes, so some legal move is returned.
+        """
+        if self.terminal(board):
+            return None
+        if time_limit is None:
+            time_limit = self.time_limit
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+        cells = [cell for row in board for cell in row]
+        empty = cells.count(EMPTY)
+        player = self.player(board)
+        self.killers = [[] for _ in range(empty + 1)]
+        self.history = [0] * len(cells)
+        self.nodes = 0
+
+        best = None
+        for depth in range(1, empty + 1):
+            try:
+                score, move = self.search_root(cells, player, depth, empty, best)
+            except Timeout:
+                break
+            best = move
+
+            # Stop once the game is solved or the whole tree was searched
+            if abs(score) >= WIN - len(cells) or depth == empty:
+                break
+
+            # Later iterations may be interrupted once past the deadline
+            if depth == 1 and self.deadline is not None:
+                self.check_deadline = True
+        self.check_deadline = False
+        return divmod(best, self.n)
+
+    def search_root(self, cells, player, depth, empty, previous):
+        """
+        Searches every move at the root to depth plies, trying the
+        previous iteration's best move first. Returns (score, move).
+        """
+        moves = self.order(cells, 0)
+        if previous is not None:
+            moves.remove(previous)
+            moves.insert(0, previous)
+        alpha = -WIN - 1
+        best = moves[0]
+        for move in moves:
+            cells[move] = player
+            try:
+                score = -self.negamax(cells, other(player), depth - 1,
+                                      -WIN - 1, -alpha, 1, move, empty - 1)
+            finally:
+                cells[move] = EMPTY
+            if score > alpha:
+                alpha = score
+                best = move
+        return alpha, best
+
+    def negamax(self, cells, player, depth, alpha, beta, ply, last, empty):
+        """
+        Returns the score of cells for player to move, searched depth
+        plies deep with alpha-beta pruning. last is the move just made.
+        """
+        # Every node counts, leaves included, since each leaf pays for a
+        # full-board evaluation
+        self.nodes += 1
+        if (self.check_deadline and self.nodes & (CHECK_INTERVAL - 1) == 0
+                and time.perf_counter() > self.deadline):
+            raise Timeout
+
+        if self.wins(cells, last):
+            return -(WIN - ply)
+        if empty == 0:
+            return 0
+        if depth == 0:
+            return self.evaluate(cells, player)
+
+        best = -WIN - 1
+        for move in self.order(cells, ply):
+            cells[move] = player
+            try:
+                score = -self.negamax(cells, other(player), depth - 1,
+                                      -beta, -alpha, ply + 1, move, empty - 1)
+            finally:
+                cells[move] = EMPTY
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        # Remember the refutation for sibling positions
+                        killers = self.killers[ply]
+                        if move not in killers:
+                            killers.insert(0, move)
+                            del killers[KILLERS:]
+                        self.history[move] += depth * depth
+                        break
+        return best
+
+    def order(self, cells, ply):
+        """
+        Returns the empty cells, killer moves first, then by history
+        score and closeness to the centre.
+        """
+        killers = self.killers[ply] if ply < len(self.killers) else []
+        moves = [cell for cell in range(len(cells)) if cells[cell] is EMPTY]
+        moves.sort(key=lambda cell: (cell in killers, self.history[cell],
+                                     self.centrality[cell]), reverse=True)
+        return moves
+
+    def wins(self, cells, move):
+        """
+        Returns True if the piece at move completes a line.
+        """
+        piece = cells[move]
+        for line in self.cell_lines[move]:
+            for cell in line:
+                if cells[cell] != piece:
+                    break
+            else:
+                return True
+        return False
+
+    def evaluate(self, cells, player):
+        """
+        Scores a position for player from the lines still open to each
+        side, weighting lines with more pieces exponentially.
+        """
+        score = 0
+        weights = self.weights
+        for line in self.lines:
+            xs = os = 0
+            for cell in line:
+                piece = cells[cell]
+                if piece is X:
+                    xs += 1
+                elif piece is O:
+                    os += 1
+            if not os:
+                score += weights[xs]
+            elif not xs:
+                score -= weights[os]
+        return score if player == X else -score
+
+
+def other(player):
+    """Returns the opponent of player."""
+    return O if player == X else X
+
+
+# 3x3 tic-tac-toe, searched exhaustively
+tictactoe = Game(3, 3, 3)
+
+initial_state = tictactoe.initial_state
+player = tictactoe.player
+actions = tictactoe.actions
+result = tictactoe.result
+winner = tictactoe.winner
+terminal = tictactoe.terminal
+utility = tictactoe.utility
+minimax = tictactoe.minimax
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch the AI play an m,n,k-game against itself")
+    parser.add_argument("m", type=int, nargs="?", default=3, help="rows")
+    parser.add_argument("n", type=int, nargs="?", default=3, help="columns")
+    parser.add_argument("k", type=int, nargs="?", default=3, help="pieces in a row to win")
+    parser.add_argument("--time", type=float, default=1.0,
+                        help="search budget per move in seconds")
+    args = parser.parse_args()
+
+    try:
+        game = Game(args.m, args.n, args.k, args.time)
+    except ValueError as e:
+        parser.error(str(e))
+    board = game.initial_state()
+    while not game.terminal(board):
+        start = time.perf_counter()
+        move = game.minimax(board)
+        print(f"{game.player(board)} plays {move} "
+              f"({game.nodes} nodes, {time.perf_counter() - start:.2f}s)")
+        board = game.result(board, move)
+        for row in board:
+            print(" ".join(cell or "." for cell in row))
+        print()
+    win = game.winner(board)
+    print("Game Over: Tie." if win is None else f"Game Over: {win} wins.")
+
+
+if __name__ == "__main__":
+    main()
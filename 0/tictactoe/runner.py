@@ -1,12 +1,15 @@
 import pygame
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 import tictactoe as ttt
 
 pygame.init()
 size = width, height = 600, 400
 
+# Frames drawn per second
+fps = 30
+
 # Colors
 black = (0, 0, 0)
 white = (255, 255, 255)
@@ -17,15 +20,25 @@ mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
 moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
 
+clock = pygame.time.Clock()
+
+# The AI thinks on a worker thread so the window keeps handling events
+executor = ThreadPoolExecutor(max_workers=1)
+ai_move = None
+
 user = None
 board = ttt.initial_state()
-ai_turn = False
 
 while True:
 
+    # Position of a left click this frame, if any
+    click = None
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            executor.shutdown(wait=False, cancel_futures=True)
             sys.exit()
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            click = event.pos
 
     screen.fill(black)
 
@@ -54,14 +67,10 @@ while True:
         screen.blit(playO, playORect)
 
         # Check if button is clicked
-        click, _, _ = pygame.mouse.get_pressed()
-        if click == 1:
-            mouse = pygame.mouse.get_pos()
-            if playXButton.collidepoint(mouse):
-                time.sleep(0.2)
+        if click is not None:
+            if playXButton.collidepoint(click):
                 user = ttt.X
-            elif playOButton.collidepoint(mouse):
-                time.sleep(0.2)
+            elif playOButton.collidepoint(click):
                 user = ttt.O
 
     else:
@@ -102,29 +111,26 @@ while True:
         elif user == player:
             title = f"Play as {user}"
         else:
-            title = f"Computer thinking..."
+            dots = pygame.time.get_ticks() // 400 % 4
+            title = "Computer thinking" + "." * dots
         title = largeFont.render(title, True, white)
         titleRect = title.get_rect()
         titleRect.center = ((width / 2), 30)
         screen.blit(title, titleRect)
 
-        # Check for AI move
+        # Check for AI move, started on the worker and polled each frame
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+            if ai_move is None:
+                ai_move = executor.submit(ttt.minimax, [list(row) for row in board])
+            elif ai_move.done():
+                board = ttt.result(board, ai_move.result())
+                ai_move = None
 
         # Check for a user move
-        click, _, _ = pygame.mouse.get_pressed()
-        if click == 1 and user == player and not game_over:
-            mouse = pygame.mouse.get_pos()
+        if click is not None and user == player and not game_over:
             for i in range(3):
                 for j in range(3):
-                    if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(mouse)):
+                    if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(click)):
                         board = ttt.result(board, (i, j))
 
         if game_over:
@@ -134,13 +140,9 @@ while True:
             againRect.center = againButton.center
             pygame.draw.rect(screen, white, againButton)
             screen.blit(again, againRect)
-            click, _, _ = pygame.mouse.get_pressed()
-            if click == 1:
-                mouse = pygame.mouse.get_pos()
-                if againButton.collidepoint(mouse):
-                    time.sleep(0.2)
-                    user = None
-                    board = ttt.initial_state()
-                    ai_turn = False
+            if click is not None and againButton.collidepoint(click):
+                user = None
+                board = ttt.initial_state()
 
     pygame.display.flip()
+    clock.tick(fps)
@@ -2,13 +2,108 @@
 Tic Tac Toe Player
 """
 
-import math
 import copy
+import functools
+import math
+import os
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Solution book: one byte per board, indexed by the board read as a
+# base-3 number with EMPTY = 0, X = 1, O = 2 (cell (0, 0) least
+# significant). Each byte is 16 * (value + 1) + move, move being 3 * i + j,
+# or NO_MOVE for finished games; boards never reached hold UNKNOWN.
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tictactoe.book")
+BOOK_MAGIC = b"TTTBOOK1"
+BOOK_SIZE = 3 ** 9
+NO_MOVE = 15
+UNKNOWN = 255
+
+# The 8 rotations and reflections of the board, as maps of a cell (i, j)
+# to where it lands
+SYMMETRIES = (
+    lambda i, j: (i, j),
+    lambda i, j: (j, 2 - i),
+    lambda i, j: (2 - i, 2 - j),
+    lambda i, j: (2 - j, i),
+    lambda i, j: (i, 2 - j),
+    lambda i, j: (2 - i, j),
+    lambda i, j: (j, i),
+    lambda i, j: (2 - j, 2 - i)
+)
+
+# For each symmetry, the cell of the original board that lands on each
+# cell of the transformed one, in row-major order
+SOURCES = tuple(
+    tuple(source for target, source in sorted(
+        (symmetry(i, j), (i, j)) for i in range(3) for j in range(3)))
+    for symmetry in SYMMETRIES
+)
+
+
+class TranspositionTable():
+    """
+    Minimax results keyed on the canonical form of a board: the smallest
+    of its 8 symmetric images. Boards that are rotations or reflections
+    of each other share one entry, with the best move stored in
+    canonical coordinates.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def canonical(self, board):
+        """
+        Returns the canonical key of board and the index of the symmetry
+        that maps board onto it.
+        """
+        return min(
+            (tuple(board[i][j] or "" for i, j in sources), index)
+            for index, sources in enumerate(SOURCES)
+        )
+
+    def get(self, board):
+        """
+        Returns the stored (value, action) for board with the action
+        mapped back onto board, or None, counting hits and misses.
+        """
+        key, index = self.canonical(board)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        value, action = entry
+        if action is not None:
+            action = SOURCES[index][3 * action[0] + action[1]]
+        return value, action
+
+    def put(self, board, value, action):
+        """Stores the minimax (value, action) of board."""
+        key, index = self.canonical(board)
+        if action is not None:
+            action = SYMMETRIES[index](*action)
+        self.entries[key] = (value, action)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+table = TranspositionTable()
+
+
+def cache_info():
+    """
+    Returns transposition table hits, misses and size.
+    """
+    return {"hits": table.hits, "misses": table.misses, "size": len(table.entries)}
+
 def initial_state():
     """
     Returns starting state of the board.
@@ -70,18 +165,21 @@ def winner(board):
     """
     # Check if there is a winner in the rows
     for row in board:
-        if (row[0] == row[1] and row[1] == row[2]):
+        if (row[0] is not EMPTY and row[0] == row[1] and row[1] == row[2]):
             return row[0]
 
     # Check if there is a winner in the columns
     for j in range(3):
-        if (board[0][j] == board[1][j] and board[2][j] == board[1][j]):
+        if (board[0][j] is not EMPTY and board[0][j] == board[1][j]
+                and board[2][j] == board[1][j]):
             return board[0][j]
 
     # Check there is a winner in the diagonals
-    if (board[0][0] == board[1][1] and board[1][1] == board[2][2]):
+    if (board[1][1] is not EMPTY and board[0][0] == board[1][1]
+            and board[1][1] == board[2][2]):
         return board[0][0]
-    if (board[0][2] == board[1][1] and board[1][1] == board[2][0]):
+    if (board[1][1] is not EMPTY and board[0][2] == board[1][1]
+            and board[1][1] == board[2][0]):
         return board[1][1]
 
     # If none of the above return, return None
@@ -118,61 +216,183 @@ def utility(board):
 
 def minimax(board):
     """
-    Returns the optimal action for the current player on the board.
+    Returns the optimal action for the current player on the board,
+    read from the solution book when one has been built.
     """
     if (terminal(board)):
         return None
-    acts = actions(board)
+    book = load_book()
+    if book is not None:
+        entry = book[book_index(board)]
+        if entry != UNKNOWN:
+            return divmod(entry % 16, 3)
     turn = player(board)
     if (turn == X):
-        val, action = max_value(board)
+        val, action = max_value(Position(board))
         return action
     else:
-        val, action = min_value(board)
+        val, action = min_value(Position(board))
         return action
 
 
-def max_value(board):
+def book_index(board):
+    """
+    Returns the position of board in the solution book.
+    """
+    index = 0
+    for row in reversed(board):
+        for elem in reversed(row):
+            index = 3 * index + (1 if elem == X else 2 if elem == O else 0)
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def load_book(path=BOOK_PATH):
+    """
+    Returns the solution book at path, or None if it is missing or
+    invalid. Loaded once, on first use.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if data[:len(BOOK_MAGIC)] != BOOK_MAGIC or len(data) != len(BOOK_MAGIC) + BOOK_SIZE:
+        return None
+    return data[len(BOOK_MAGIC):]
+
+
+def build_book(path=BOOK_PATH):
+    """
+    Solves every position reachable from initial_state() and writes the
+    solution book to path. Returns the number of positions.
+    """
+    book = bytearray([UNKNOWN]) * BOOK_SIZE
+    stack = [initial_state()]
+    positions = 0
+    while stack:
+        board = stack.pop()
+        index = book_index(board)
+        if book[index] != UNKNOWN:
+            continue
+        positions += 1
+        if terminal(board):
+            book[index] = 16 * (utility(board) + 1) + NO_MOVE
+            continue
+        if player(board) == X:
+            value, action = max_value(Position(board))
+        else:
+            value, action = min_value(Position(board))
+        book[index] = 16 * (value + 1) + 3 * action[0] + action[1]
+        for action in actions(board):
+            stack.append(result(board, action))
+
+    temp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp, "wb") as f:
+            f.write(BOOK_MAGIC + bytes(book))
+        os.replace(temp, path)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+    load_book.cache_clear()
+    return positions
+
+
+class Position():
+    """
+    A board searched in place. make_move and undo_move update the board,
+    the side to move and the list of empty cells incrementally, so the
+    search never copies or rescans a board.
+    """
+
+    def __init__(self, board):
+        self.board = [list(row) for row in board]
+        self.turn = player(board)
+        self.empty = [(i, j) for i in range(3) for j in range(3)
+                      if board[i][j] == EMPTY]
+
+    def make_move(self, action):
+        """
+        Plays action (i, j) for the side to move.
+        """
+        i, j = action
+        self.board[i][j] = self.turn
+        self.empty.remove(action)
+        self.turn = O if self.turn == X else X
+
+    def undo_move(self, action):
+        """
+        Takes back action (i, j), the last move made.
+        """
+        i, j = action
+        self.board[i][j] = EMPTY
+        self.empty.append(action)
+        self.turn = O if self.turn == X else X
+
+    def terminal(self):
+        return not self.empty or winner(self.board) is not None
+
+
+def max_value(position):
     """
     Returns a pair the value, and action which results in the max value, which
-    would result in an X win
+    would result in an X win. position is a Position with X to move; it is
+    restored before returning.
     """
-    if terminal(board):
+    board = position.board
+    if position.terminal():
         return utility(board), None
+    entry = table.get(board)
+    if entry is not None:
+        return entry
     # in this case can be any value less than -1
     value = -500
     opt_action = None
-    for action in actions(board):
-        res = result(board, action)
-        val, act = min_value(res)
+    for action in tuple(position.empty):
+        position.make_move(action)
+        val, act = min_value(position)
+        position.undo_move(action)
         if (val > value):
             value = val
             opt_action = action
             # If we already have a value that results in 1, no need to look
             # at the rest
             if value == 1:
-                return value, opt_action
+                break
+    table.put(board, value, opt_action)
     return value, opt_action
 
-def min_value(board):
+def min_value(position):
     """
     Returns a pair the value, and action which results in the min value, which
-    would result in a O win
+    would result in a O win. position is a Position with O to move; it is
+    restored before returning.
     """
-    if terminal(board):
+    board = position.board
+    if position.terminal():
         return utility(board), None
+    entry = table.get(board)
+    if entry is not None:
+        return entry
     # in this case can be any value greater than 1
     value = 500
     opt_action = None
-    for action in actions(board):
-        res = result(board, action)
-        val, act = max_value(res)
+    for action in tuple(position.empty):
+        position.make_move(action)
+        val, act = max_value(position)
+        position.undo_move(action)
         if (val < value):
             value = val
             opt_action = action
             # If we already have a value that results in -1, no need to look
             # at the rest
             if value == -1:
-                return value, opt_action
+                break
+    table.put(board, value, opt_action)
     return value, opt_action
 
+
+if __name__ == "__main__":
+    positions = build_book()
+    print(f"Solved {positions} positions into {BOOK_PATH}")
@@ -0,0 +1,79 @@
+"""
+Micro-benchmark of sentence evaluation in logic.py.
+
+Measures the cost per model of evaluating each puzzle's knowledge base,
+and a generated one with more people, three ways: walking the Sentence
+tree with evaluate on a dict model, and calling the compiled function
+on a tuple model and on a bit-integer model.
+"""
+
+import argparse
+import itertools
+import random
+import time
+
+from logic import Symbol, Not, And, Or, Implication, Biconditional
+import puzzle
+
+
+def generated_knowledge(people, seed=0):
+    """
+    Returns a knights-and-knaves knowledge base where each of people
+    claims the next person is a knight or a knave, chosen at random.
+    """
+    rng = random.Random(seed)
+    knights = [Symbol(f"{i} is a Knight") for i in range(people)]
+    knaves = [Symbol(f"{i} is a Knave") for i in range(people)]
+    knowledge = And()
+    for i in range(people):
+        knowledge.add(Or(knights[i], knaves[i]))
+        knowledge.add(Not(And(knights[i], knaves[i])))
+        other = (i + 1) % people
+        claim = knights[other] if rng.random() < 0.5 else knaves[other]
+        knowledge.add(Biconditional(knights[i], claim))
+    return knowledge
+
+
+def per_model(function, models, repeat):
+    """Returns the best time per model, in nanoseconds, of calling function on models."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for model in models:
+            function(model)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(models) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Sentence evaluation")
+    parser.add_argument("--people", type=int, default=8,
+                        help="people in the generated knowledge base (2 symbols each)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    knowledge_bases = [
+        ("puzzle 0", puzzle.knowledge0),
+        ("puzzle 1", puzzle.knowledge1),
+        ("puzzle 2", puzzle.knowledge2),
+        ("puzzle 3", puzzle.knowledge3),
+        (f"generated {args.people}", generated_knowledge(args.people))
+    ]
+
+    print(f"{'Knowledge':<14}{'Symbols':>8}{'evaluate':>12}{'tuple':>10}{'bits':>10}{'speedup':>9}")
+    for label, knowledge in knowledge_bases:
+        symbols = sorted(knowledge.symbols())
+        tuples = list(itertools.product((False, True), repeat=len(symbols)))
+        dicts = [dict(zip(symbols, model)) for model in tuples]
+        integers = list(range(2 ** len(symbols)))
+
+        interpreted = per_model(knowledge.evaluate, dicts, args.repeat)
+        compiled = per_model(knowledge.compile(symbols), tuples, args.repeat)
+        bits = per_model(knowledge.compile(symbols, bits=True), integers, args.repeat)
+        print(f"{label:<14}{len(symbols):>8}{interpreted:>10.0f}ns{compiled:>8.0f}ns"
+              f"{bits:>8.0f}ns{interpreted / compiled:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 import itertools
 
+# Above this many symbols, model_check hands entailment to the SAT solver
+# in sat.py instead of enumerating all 2^n models
+SAT_THRESHOLD = 20
+
 
 class Sentence():
 
@@ -15,6 +19,53 @@ class Sentence():
         """Returns a set of all symbols in the logical sentence."""
         return set()
 
+    def operands(self):
+        """Returns the subsentences the sentence is built from."""
+        return []
+
+    def expression(self, *operands):
+        """Returns a Python expression for the sentence over operand names."""
+        raise Exception("nothing to compile")
+
+    def compile(self, symbols=None, bits=False):
+        """
+        Compiles the sentence into one generated Python function of a
+        model, where the model is a tuple of truth values ordered like
+        symbols (default: sorted symbol names), or with bits=True an
+        integer whose bit i is the value of symbols[i]. Each distinct
+        subsentence is evaluated once, into a local variable.
+        """
+        if symbols is None:
+            symbols = sorted(self.symbols())
+        index = {name: i for i, name in enumerate(symbols)}
+        names = {}
+        lines = []
+
+        def visit(sentence):
+            name = names.get(sentence)
+            if name is not None:
+                return name
+            if isinstance(sentence, Symbol):
+                if sentence.name not in index:
+                    raise Exception(f"variable {sentence.name} not in model")
+                i = index[sentence.name]
+                expression = f"model >> {i} & 1" if bits else f"model[{i}]"
+            else:
+                expression = sentence.expression(
+                    *[visit(operand) for operand in sentence.operands()])
+            name = names[sentence] = f"t{len(names)}"
+            lines.append(f"    {name} = {expression}")
+            return name
+
+        result = visit(self)
+        source = "def evaluate(model):\n" + "\n".join(lines) + f"\n    return bool({result})\n"
+        namespace = {}
+        exec(compile(source, "<sentence>", "exec"), namespace)
+        evaluate = namespace["evaluate"]
+        evaluate.symbols = list(symbols)
+        evaluate.source = source
+        return evaluate
+
     @classmethod
     def validate(cls, sentence):
         if not isinstance(sentence, Sentence):
@@ -86,6 +137,12 @@ class Not(Sentence):
     def evaluate(self, model):
         return not self.operand.evaluate(model)
 
+    def operands(self):
+        return [self.operand]
+
+    def expression(self, operand):
+        return f"not {operand}"
+
     def formula(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
@@ -120,6 +177,12 @@ class And(Sentence):
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
 
+    def operands(self):
+        return self.conjuncts
+
+    def expression(self, *conjuncts):
+        return f"({' and '.join(conjuncts)})" if conjuncts else "True"
+
     def formula(self):
         if len(self.conjuncts) == 1:
             return self.conjuncts[0].formula()
@@ -151,6 +214,12 @@ class Or(Sentence):
     def evaluate(self, model):
         return any(disjunct.evaluate(model) for disjunct in self.disjuncts)
 
+    def operands(self):
+        return self.disjuncts
+
+    def expression(self, *disjuncts):
+        return f"({' or '.join(disjuncts)})" if disjuncts else "False"
+
     def formula(self):
         if len(self.disjuncts) == 1:
             return self.disjuncts[0].formula()
@@ -183,6 +252,12 @@ class Implication(Sentence):
         return ((not self.antecedent.evaluate(model))
                 or self.consequent.evaluate(model))
 
+    def operands(self):
+        return [self.antecedent, self.consequent]
+
+    def expression(self, antecedent, consequent):
+        return f"(not {antecedent} or {consequent})"
+
     def formula(self):
         antecedent = Sentence.parenthesize(self.antecedent.formula())
         consequent = Sentence.parenthesize(self.consequent.formula())
@@ -216,6 +291,12 @@ class Biconditional(Sentence):
                 or (not self.left.evaluate(model)
                     and not self.right.evaluate(model)))
 
+    def operands(self):
+        return [self.left, self.right]
+
+    def expression(self, left, right):
+        return f"(not {left}) == (not {right})"
+
     def formula(self):
         left = Sentence.parenthesize(str(self.left))
         right = Sentence.parenthesize(str(self.right))
@@ -228,36 +309,15 @@ class Biconditional(Sentence):
 def model_check(knowledge, query):
     """Checks if knowledge base entails query."""
 
-    def check_all(knowledge, query, symbols, model):
-        """Checks if knowledge base entails query, given a particular model."""
-
-        # If model has an assignment for each symbol
-        if not symbols:
-
-            # If knowledge base is true in model, then query must also be true
-            if knowledge.evaluate(model):
-                return query.evaluate(model)
-            return True
-        else:
-
-            # Choose one of the remaining unused symbols
-            remaining = symbols.copy()
-            p = remaining.pop()
-
-            # Create a model where the symbol is true
-            model_true = model.copy()
-            model_true[p] = True
-
-            # Create a model where the symbol is false
-            model_false = model.copy()
-            model_false[p] = False
-
-            # Ensure entailment holds in both models
-            return (check_all(knowledge, query, remaining, model_true) and
-                    check_all(knowledge, query, remaining, model_false))
-
     # Get all symbols in both knowledge and query
     symbols = set.union(knowledge.symbols(), query.symbols())
 
-    # Check that knowledge entails query
-    return check_all(knowledge, query, symbols, dict())
+    # Large knowledge bases are checked as unsatisfiability of KB ∧ ¬query
+    if len(symbols) > SAT_THRESHOLD:
+        from sat import entails
+        return entails(knowledge, query)
+
+    # Entailment holds if knowledge => query is true in every model; it is
+    # compiled once and evaluated over tuples of truth values
+    check = Implication(knowledge, query).compile(sorted(symbols))
+    return all(map(check, itertools.product((False, True), repeat=len(symbols))))
@@ -0,0 +1,333 @@
+"""
+SAT backend for logic.py.
+
+Sentences are converted to CNF with the Tseitin transformation, which
+names every compound subsentence with a fresh variable so the clause
+count stays linear in the size of the sentence. Clauses are solved by a
+CDCL solver: unit propagation over two watched literals per clause,
+first-UIP clause learning with non-chronological backjumping, activity
+based decisions with saved phases, and Luby restarts.
+
+Knowledge entails a query exactly when knowledge ∧ ¬query has no model.
+"""
+
+from logic import Symbol, Not, And, Or, Implication, Biconditional
+
+# Conflicts per unit of the Luby restart sequence
+RESTART_UNIT = 100
+
+# Variable activities decay by this factor after every conflict
+ACTIVITY_DECAY = 0.95
+
+
+class CNF():
+    """
+    Clauses over integer variables 1..count; literal -v is the negation
+    of v. Symbols map to variables by name.
+    """
+
+    def __init__(self):
+        self.clauses = []
+        self.count = 0
+        self.variables = {}
+
+        # Literal naming each converted sentence, so equal subsentences
+        # share one variable
+        self.literals = {}
+
+    def variable(self):
+        """Returns a fresh variable."""
+        self.count += 1
+        return self.count
+
+    def literal(self, sentence):
+        """Returns a literal equivalent to sentence, adding its definition."""
+        literal = self.literals.get(sentence)
+        if literal is not None:
+            return literal
+
+        if isinstance(sentence, Symbol):
+            literal = self.variables.get(sentence.name)
+            if literal is None:
+                literal = self.variables[sentence.name] = self.variable()
+        elif isinstance(sentence, Not):
+            literal = -self.literal(sentence.operand)
+        elif isinstance(sentence, And):
+            parts = [self.literal(conjunct) for conjunct in sentence.conjuncts]
+            literal = self.variable()
+            for part in parts:
+                self.clauses.append([-literal, part])
+            self.clauses.append([literal] + [-part for part in parts])
+        elif isinstance(sentence, Or):
+            parts = [self.literal(disjunct) for disjunct in sentence.disjuncts]
+            literal = self.variable()
+            for part in parts:
+                self.clauses.append([literal, -part])
+            self.clauses.append([-literal] + parts)
+        elif isinstance(sentence, Implication):
+            antecedent = self.literal(sentence.antecedent)
+            consequent = self.literal(sentence.consequent)
+            literal = self.variable()
+            self.clauses.append([-literal, -antecedent, consequent])
+            self.clauses.append([literal, antecedent])
+            self.clauses.append([literal, -consequent])
+        elif isinstance(sentence, Biconditional):
+            left = self.literal(sentence.left)
+            right = self.literal(sentence.right)
+            literal = self.variable()
+            self.clauses.append([-literal, -left, right])
+            self.clauses.append([-literal, left, -right])
+            self.clauses.append([literal, left, right])
+            self.clauses.append([literal, -left, -right])
+        else:
+            raise TypeError("must be a logical sentence")
+
+        self.literals[sentence] = literal
+        return literal
+
+    def add(self, sentence):
+        """
+        Asserts sentence. Top-level conjunctions and disjunctions become
+        clauses directly instead of being named.
+        """
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or):
+            self.clauses.append([self.literal(disjunct) for disjunct in sentence.disjuncts])
+        else:
+            self.clauses.append([self.literal(sentence)])
+
+
+class Solver():
+    """CDCL solver over the clauses of a CNF."""
+
+    def __init__(self, clauses, count):
+        self.count = count
+
+        # Per variable: 1 true, -1 false, 0 unassigned; the decision
+        # level and reason clause of its assignment; activity; and the
+        # polarity it last had
+        self.values = [0] * (count + 1)
+        self.levels = [0] * (count + 1)
+        self.reasons = [None] * (count + 1)
+        self.activity = [0.0] * (count + 1)
+        self.phases = [False] * (count + 1)
+        self.increment = 1.0
+
+        # Assigned literals in order, where each decision level starts,
+        # and how far propagation has got
+        self.trail = []
+        self.trail_lim = []
+        self.head = 0
+
+        # Maps each literal to the clauses watching it; the watched
+        # literals of a clause are its first two
+        self.watches = {}
+        self.unsatisfiable = False
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def value(self, literal):
+        """Returns 1 if literal is true, -1 if false, 0 if unassigned."""
+        value = self.values[abs(literal)]
+        return value if literal > 0 else -value
+
+    def add_clause(self, clause):
+        """Adds an input clause at decision level 0."""
+        clause = list(dict.fromkeys(clause))
+        if any(-literal in clause for literal in clause):
+            return
+        if not clause:
+            self.unsatisfiable = True
+        elif len(clause) == 1:
+            value = self.value(clause[0])
+            if value == -1:
+                self.unsatisfiable = True
+            elif value == 0:
+                self.enqueue(clause[0], None)
+        else:
+            self.watch(clause)
+
+    def watch(self, clause):
+        self.watches.setdefault(clause[0], []).append(clause)
+        self.watches.setdefault(clause[1], []).append(clause)
+
+    def enqueue(self, literal, reason):
+        """Makes literal true at the current decision level."""
+        var = abs(literal)
+        self.values[var] = 1 if literal > 0 else -1
+        self.levels[var] = len(self.trail_lim)
+        self.reasons[var] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """
+        Assigns every literal forced by unit clauses. Returns a clause
+        with all literals false on conflict, else None.
+        """
+        while self.head < len(self.trail):
+            false_literal = -self.trail[self.head]
+            self.head += 1
+            watchers = self.watches.get(false_literal, [])
+            kept = self.watches[false_literal] = []
+            for i, clause in enumerate(watchers):
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                first = clause[0]
+                if self.value(first) == 1:
+                    kept.append(clause)
+                    continue
+
+                # Move the watch to any literal that is not false
+                for k in range(2, len(clause)):
+                    if self.value(clause[k]) != -1:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches.setdefault(clause[1], []).append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if self.value(first) == -1:
+                        kept.extend(watchers[i + 1:])
+                        self.head = len(self.trail)
+                        return clause
+                    self.enqueue(first, clause)
+        return None
+
+    def analyze(self, conflict):
+        """
+        Derives the first-UIP clause from a conflict. Returns the clause,
+        asserting literal first, and the level to backjump to.
+        """
+        level = len(self.trail_lim)
+        learnt = [None]
+        seen = set()
+        pending = 0
+        literal = None
+        index = len(self.trail) - 1
+        clause = conflict
+        while True:
+            for other in clause:
+                var = abs(other)
+                if other == literal or var in seen or self.levels[var] == 0:
+                    continue
+                seen.add(var)
+                self.bump(var)
+                if self.levels[var] == level:
+                    pending += 1
+                else:
+                    learnt.append(other)
+
+            # Walk back to the most recent literal involved in the conflict
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reasons[abs(literal)]
+        learnt[0] = -literal
+
+        # Watch the highest-level remaining literal second
+        backjump = 0
+        for i in range(1, len(learnt)):
+            if self.levels[abs(learnt[i])] > backjump:
+                backjump = self.levels[abs(learnt[i])]
+                learnt[1], learnt[i] = learnt[i], learnt[1]
+        return learnt, backjump
+
+    def bump(self, var):
+        self.activity[var] += self.increment
+        if self.activity[var] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.increment *= 1e-100
+
+    def backtrack(self, level):
+        """Undoes every assignment above decision level."""
+        if len(self.trail_lim) <= level:
+            return
+        start = self.trail_lim[level]
+        for literal in self.trail[start:]:
+            var = abs(literal)
+            self.phases[var] = literal > 0
+            self.values[var] = 0
+            self.reasons[var] = None
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.head = len(self.trail)
+
+    def decide(self):
+        """Returns the unassigned variable with the highest activity, or None."""
+        best = None
+        for var in range(1, self.count + 1):
+            if self.values[var] == 0 and (best is None or self.activity[var] > self.activity[best]):
+                best = var
+        return best
+
+    def solve(self):
+        """
+        Returns a satisfying assignment as a list indexed by variable,
+        or None if the clauses are unsatisfiable.
+        """
+        if self.unsatisfiable:
+            return None
+        conflicts = 0
+        restarts = 1
+        limit = luby(restarts) * RESTART_UNIT
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                if not self.trail_lim:
+                    return None
+                learnt, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learnt) == 1:
+                    self.enqueue(learnt[0], None)
+                else:
+                    self.watch(learnt)
+                    self.enqueue(learnt[0], learnt)
+                self.increment /= ACTIVITY_DECAY
+
+                conflicts += 1
+                if conflicts >= limit:
+                    self.backtrack(0)
+                    conflicts = 0
+                    restarts += 1
+                    limit = luby(restarts) * RESTART_UNIT
+                continue
+
+            var = self.decide()
+            if var is None:
+                return [value == 1 for value in self.values]
+            self.trail_lim.append(len(self.trail))
+            self.enqueue(var if self.phases[var] else -var, None)
+
+
+def luby(i):
+    """Returns the i-th term (from 1) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    while True:
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+        if (1 << k) - 1 == i:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+def satisfiable(sentence):
+    """Returns a model of sentence as a dict of symbol names, or None."""
+    cnf = CNF()
+    cnf.add(sentence)
+    assignment = Solver(cnf.clauses, cnf.count).solve()
+    if assignment is None:
+        return None
+    return {name: assignment[var] for name, var in cnf.variables.items()}
+
+
+def entails(knowledge, query):
+    """Checks if knowledge base entails query, as unsatisfiability of knowledge ∧ ¬query."""
+    cnf = CNF()
+    cnf.add(knowledge)
+    cnf.clauses.append([-cnf.literal(query)])
+    return Solver(cnf.clauses, cnf.count).solve() is None